@@ -1,9 +1,13 @@
 import pandas as pd
-import re
-from collections import Counter
 
-# Load data
-df = pd.read_csv("data/processed/processed_reviews_sentiment.csv")
+from storage import read_dataset
+from aggregations import bank_metrics
+from term_matrix import TermMatrix, phrase_tokens
+from issue_tagger import IssueTagger, COMMON_ISSUES, THEMES
+
+# Load data (only the columns used below)
+df = read_dataset("data/processed/processed_reviews_sentiment",
+                  columns=['bank', 'review', 'rating', 'sentiment_score'])
 df['review'] = df['review'].fillna('')
 
 print("=== STEP 3: IDENTIFY DRIVERS & PAIN POINTS ===\n")
@@ -19,59 +23,25 @@ stopwords = {
     'dont', 'doesnt', 'its', 'one', 'all', 'now', 'use', 'used', 'using'
 }
 
-# Function to extract meaningful phrases (bigrams)
-def extract_meaningful_phrases(text_series, top_n=15):
-    """Extract meaningful phrases from reviews"""
-    all_text = ' '.join(text_series.astype(str).tolist()).lower()
-    
-    # Clean text
-    text = re.sub(r'[^\w\s]', '', all_text)
-    words = text.split()
-    
-    # Filter stopwords
-    filtered_words = [word for word in words if word not in stopwords and len(word) > 2]
-    
-    # Create bigrams (two-word phrases)
-    bigrams = [' '.join(filtered_words[i:i+2]) for i in range(len(filtered_words)-1)]
-    
-    # Count frequency
-    bigram_counts = Counter(bigrams)
-    
-    # Return most common bigrams that are meaningful
-    meaningful_bigrams = []
-    for bigram, count in bigram_counts.most_common(top_n * 2):
-        # Filter out meaningless combinations
-        words_in_bigram = bigram.split()
-        if (words_in_bigram[0] not in stopwords and 
-            words_in_bigram[1] not in stopwords and
-            len(words_in_bigram[0]) > 2 and 
-            len(words_in_bigram[1]) > 2):
-            meaningful_bigrams.append((bigram, count))
-            if len(meaningful_bigrams) >= top_n:
-                break
-    
-    return meaningful_bigrams
+# Tokenize every review once into bigram counts; phrases for any slice are masked column sums
+phrases = TermMatrix(df['review'], lambda text: phrase_tokens(text, stopwords), ngram_range=(2, 2))
+
+def extract_meaningful_phrases(mask, top_n=15):
+    """Most common two-word phrases (stopwords removed) in the reviews selected by mask"""
+    return phrases.top_terms(mask, top_n)
 
 # Function to categorize issues
+theme_tagger = IssueTagger(THEMES)
+
 def categorize_issue(keyword):
     """Categorize keywords into themes"""
-    categories = {
-        'Technical Issues': ['crash', 'bug', 'error', 'issue', 'problem', 'working', 'work', 'fix', 'update'],
-        'Performance': ['slow', 'lag', 'loading', 'speed', 'time', 'wait', 'fast', 'quick'],
-        'Usability': ['easy', 'hard', 'difficult', 'simple', 'complex', 'interface', 'design', 'user'],
-        'Features': ['feature', 'transfer', 'payment', 'login', 'password', 'account', 'balance'],
-        'Customer Service': ['support', 'service', 'help', 'response', 'contact'],
-        'Security': ['secure', 'safe', 'trust', 'password', 'login', 'verification'],
-        'General Sentiment': ['best', 'worst', 'nice', 'great', 'good', 'bad', 'super', 'excellent', 'terrible']
-    }
-    
-    for category, keywords in categories.items():
-        if any(kw in keyword.lower() for kw in keywords):
-            return category
-    
-    return 'Other'
+    return theme_tagger.first(keyword)
 
-# Analyze each bank
+# Analyze each bank (counts and means come from one grouped pass)
+metrics = bank_metrics(df)
+# Tag every review with its issue categories in one scan, then count per bank
+issue_tagger = IssueTagger(COMMON_ISSUES)
+issue_counts = issue_tagger.counts(issue_tagger.tag(df['review']), df['bank'].astype(str))
 bank_insights = {}
 
 for bank in df['bank'].unique():
@@ -79,16 +49,16 @@ for bank in df['bank'].unique():
     print(f"{bank.upper()} BANK - DRIVERS & PAIN POINTS")
     print(f"{'='*60}")
     
-    bank_df = df[df['bank'] == bank]
+    in_bank = (df['bank'] == bank).to_numpy()
     
     # DRIVERS: What users like (from 4-5 star reviews)
-    high_ratings = bank_df[bank_df['rating'] >= 4]
+    high_ratings = in_bank & (df['rating'] >= 4).to_numpy()
+    # computed once per slice, reused for the summary below
+    positive_phrases = extract_meaningful_phrases(high_ratings) if high_ratings.any() else []
+    negative_phrases = []
     
-    if len(high_ratings) > 0:
-        print(f"\n📈 DRIVERS (from {len(high_ratings)} positive reviews):")
-        
-        # Extract meaningful phrases from positive reviews
-        positive_phrases = extract_meaningful_phrases(high_ratings['review'])
+    if high_ratings.any():
+        print(f"\n📈 DRIVERS (from {high_ratings.sum()} positive reviews):")
         
         drivers = []
         for phrase, count in positive_phrases[:8]:  # Top 8 phrases
@@ -104,13 +74,13 @@ for bank in df['bank'].unique():
                 print(f"  • {phrase}: {count} mentions")
     
     # PAIN POINTS: What users complain about (from 1-2 star reviews)
-    low_ratings = bank_df[bank_df['rating'] <= 2]
+    low_ratings = in_bank & (df['rating'] <= 2).to_numpy()
     
-    if len(low_ratings) > 0:
-        print(f"\n⚠️ PAIN POINTS (from {len(low_ratings)} negative reviews):")
+    if low_ratings.any():
+        print(f"\n⚠️ PAIN POINTS (from {low_ratings.sum()} negative reviews):")
         
         # Extract meaningful phrases from negative reviews
-        negative_phrases = extract_meaningful_phrases(low_ratings['review'])
+        negative_phrases = extract_meaningful_phrases(low_ratings)
         
         pain_points = []
         for phrase, count in negative_phrases[:8]:  # Top 8 phrases
@@ -133,33 +103,21 @@ for bank in df['bank'].unique():
     print(f"\n🔍 SPECIFIC ISSUES IDENTIFIED:")
     
     # Check for specific common issues
-    common_issues = {
-        'Login/Account Issues': ['login', 'password', 'account', 'access', 'verification'],
-        'Transaction Problems': ['transfer', 'payment', 'transaction', 'money', 'send'],
-        'App Performance': ['crash', 'freeze', 'hang', 'not working', 'stop'],
-        'Speed Issues': ['slow', 'loading', 'wait', 'time', 'delay'],
-        'Update Problems': ['update', 'version', 'new version', 'upgrade'],
-        'Customer Support': ['support', 'help', 'service', 'response']
-    }
-    
-    for issue, keywords in common_issues.items():
-        count = 0
-        for review in bank_df['review']:
-            if any(keyword in review.lower() for keyword in keywords):
-                count += 1
+    for issue in COMMON_ISSUES:
+        count = issue_counts.loc[bank, issue]
         
         if count > 5:  # Only report if mentioned more than 5 times
-            percentage = (count / len(bank_df)) * 100
+            percentage = (count / metrics.loc[bank, 'total_reviews']) * 100
             print(f"  • {issue}: {count} reviews ({percentage:.1f}%)")
     
     # Store insights for this bank
     bank_insights[bank] = {
-        'total_reviews': len(bank_df),
-        'avg_rating': bank_df['rating'].mean(),
-        'positive_reviews': len(bank_df[bank_df['rating'] >= 4]),
-        'negative_reviews': len(bank_df[bank_df['rating'] <= 2]),
-        'drivers': extract_meaningful_phrases(high_ratings['review'])[:5] if len(high_ratings) > 0 else [],
-        'pain_points': extract_meaningful_phrases(low_ratings['review'])[:5] if len(low_ratings) > 0 else []
+        'total_reviews': metrics.loc[bank, 'total_reviews'],
+        'avg_rating': metrics.loc[bank, 'avg_rating'],
+        'positive_reviews': metrics.loc[bank, 'positive_reviews'],
+        'negative_reviews': metrics.loc[bank, 'negative_reviews'],
+        'drivers': positive_phrases[:5],
+        'pain_points': negative_phrases[:5]
     }
 
 # Comparative analysis
@@ -237,7 +195,7 @@ for bank, data in bank_insights.items():
         'negative_reviews': data['negative_reviews'],
         'top_drivers': drivers_str,
         'top_pain_points': pain_points_str,
-        'sentiment_score': round(df[df['bank'] == bank]['sentiment_score'].mean(), 3)
+        'sentiment_score': round(metrics.loc[bank, 'avg_sentiment'], 3)
     })
 
 insights_df = pd.DataFrame(insights_list)
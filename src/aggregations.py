@@ -0,0 +1,73 @@
+import pandas as pd
+
+LABELS = ["positive", "neutral", "negative"]
+RATINGS = [1, 2, 3, 4, 5]
+
+
+def bank_metrics(df):
+    """Per-bank review metrics from one grouped pass over df.
+
+    Every metric is first expressed as a per-review column (indicator or
+    value to add up), so a single groupby().sum() yields all of them.
+    Returns one row per bank, in order of first appearance, with:
+      total_reviews, avg_rating, avg_sentiment,
+      <label>_pct for each sentiment label (if sentiment_label is present),
+      rating_<r> counts, positive_reviews (4-5 stars), negative_reviews (1-2 stars),
+      sentiment_r<r> = mean sentiment_score of r-star reviews (NaN if none).
+    """
+    rating = pd.to_numeric(df["rating"])
+    has_score = "sentiment_score" in df
+    parts = {
+        "total_reviews": 1,
+        "rating_sum": rating.fillna(0),
+        "rating_n": rating.notna(),
+    }
+    if has_score:
+        score = df["sentiment_score"]
+        parts["sentiment_sum"] = score.fillna(0)
+        parts["sentiment_n"] = score.notna()
+    if "sentiment_label" in df:
+        for label in LABELS:
+            parts[f"{label}_n"] = df["sentiment_label"] == label
+    for r in RATINGS:
+        is_r = rating == r
+        parts[f"rating_{r}"] = is_r
+        if has_score:
+            parts[f"sentiment_sum_r{r}"] = score.where(is_r, 0).fillna(0)
+            parts[f"sentiment_n_r{r}"] = is_r & score.notna()
+
+    sums = pd.DataFrame(parts, index=df.index).astype(float) \
+        .groupby(df["bank"].astype(str).to_numpy(), sort=False).sum()
+
+    metrics = pd.DataFrame(index=sums.index)
+    metrics.index.name = "bank"
+    total = sums["total_reviews"]
+    metrics["total_reviews"] = total.astype(int)
+    metrics["avg_rating"] = sums["rating_sum"] / sums["rating_n"]
+    if has_score:
+        metrics["avg_sentiment"] = sums["sentiment_sum"] / sums["sentiment_n"]
+    if "sentiment_label" in df:
+        for label in LABELS:
+            metrics[f"{label}_pct"] = sums[f"{label}_n"] / total * 100
+    for r in RATINGS:
+        metrics[f"rating_{r}"] = sums[f"rating_{r}"].astype(int)
+    metrics["positive_reviews"] = metrics["rating_4"] + metrics["rating_5"]
+    metrics["negative_reviews"] = metrics["rating_1"] + metrics["rating_2"]
+    if has_score:
+        for r in RATINGS:
+            n = sums[f"sentiment_n_r{r}"]
+            metrics[f"sentiment_r{r}"] = (sums[f"sentiment_sum_r{r}"] / n).where(n > 0)
+    return metrics
+
+
+def rating_histogram(metrics):
+    """banks x star-rating count table from bank_metrics output"""
+    hist = metrics[[f"rating_{r}" for r in RATINGS]]
+    hist.columns = RATINGS
+    return hist
+
+
+def sentiment_by_rating(metrics, bank):
+    """{rating: mean sentiment} for the ratings a bank has reviews for"""
+    row = metrics.loc[bank, [f"sentiment_r{r}" for r in RATINGS]]
+    return {r: v for r, v in zip(RATINGS, row) if pd.notna(v)}
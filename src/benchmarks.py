@@ -0,0 +1,160 @@
+import os
+import sys
+import time
+import random
+import subprocess
+import pandas as pd
+
+# ---------------- CONFIG ----------------
+N_REVIEWS = 1_000_000
+SEED = 42
+N_DB_REVIEWS = 10_000_000   # rows in the synthetic reviews table (needs PostgreSQL)
+DB_BENCH_SCHEMA = "bench_reviews"
+# ---------------------------------------
+
+WORDS = ["app", "good", "bad", "slow", "transfer", "login", "crash", "update",
+         "nice", "worst", "best", "money", "account", "otp", "balance", "fast"]
+EXTRAS = ["!!", "...", "😀", "👍", "http://bit.ly/x1", "  ", "\n", "Très", "#1", "?"]
+
+
+def synthetic_reviews(n=N_REVIEWS, seed=SEED):
+    """Random review-like strings with urls, emoji, punctuation and odd spacing"""
+    rng = random.Random(seed)
+    reviews = []
+    for _ in range(n):
+        tokens = rng.choices(WORDS, k=rng.randint(1, 25))
+        tokens += rng.choices(EXTRAS, k=rng.randint(0, 4))
+        rng.shuffle(tokens)
+        text = " ".join(tokens)
+        reviews.append(text.upper() if rng.random() < 0.1 else text.capitalize())
+    # a few missing reviews, like the raw scrape has
+    for i in range(0, n, 1000):
+        reviews[i] = None
+    return pd.Series(reviews, dtype=object)
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<32} {elapsed:8.2f}s")
+    return result, elapsed
+
+
+def bench_clean_text(n=N_REVIEWS):
+    from clean_reviews import clean_text, clean_texts, HAS_PYARROW
+
+    print(f"\n=== clean_text vs clean_texts on {n:,} synthetic reviews ===")
+    texts = synthetic_reviews(n)
+
+    expected, base = timed("apply(clean_text)", lambda: texts.apply(clean_text))
+    backends = ["python"] + (["pyarrow"] if HAS_PYARROW else [])
+    for backend in backends:
+        result, elapsed = timed(f"clean_texts(backend={backend!r})",
+                                lambda: clean_texts(texts, backend=backend))
+        assert (result.astype(object).values == expected.values).all(), f"{backend} output differs"
+        print(f"  {'':<32} {base / elapsed:8.1f}x speedup, output identical")
+
+
+def _run_python(code, repeat=3):
+    """Best wall-clock time of a fresh interpreter running `code` with src/ importable"""
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], env=env, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_topic_startup():
+    print("\n=== topic_modeling startup (fresh interpreter, best of 3) ===")
+    base = _run_python("pass")
+    imported = _run_python("import topic_modeling")
+    first_use = _run_python("import topic_modeling; topic_modeling.get_nlp()")
+    eager = _run_python("import spacy; spacy.load('en_core_web_sm', disable=['parser', 'ner'])")
+    print(f"  {'interpreter only':<32} {base:8.2f}s")
+    print(f"  {'import topic_modeling':<32} {imported:8.2f}s")
+    print(f"  {'import + first get_nlp()':<32} {first_use:8.2f}s")
+    print(f"  {'old eager spacy.load':<32} {eager:8.2f}s")
+
+
+SCHEMA_QUERIES = {
+    "bank, one quarter": """SELECT COUNT(*), AVG(rating) FROM {table}
+        WHERE bank_id = 2 AND review_date BETWEEN '2024-01-01' AND '2024-03-31'""",
+    "bank, negative share": """SELECT COUNT(*) FROM {table}
+        WHERE bank_id = 1 AND sentiment_label = 'negative'""",
+    "bank x month, 2023": """SELECT bank_id, date_trunc('month', review_date), COUNT(*) FROM {table}
+        WHERE review_date >= '2023-01-01' AND review_date < '2024-01-01' GROUP BY 1, 2""",
+    "text ILIKE (trigram)": "SELECT COUNT(*) FROM {table} WHERE review_text ILIKE '%timeout%'",
+    "full-text search": """SELECT COUNT(*) FROM {table}
+        WHERE to_tsvector('english', coalesce(review_text, '')) @@ plainto_tsquery('english', 'timeout')""",
+}
+
+
+def _best_query_time(cur, sql, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cur.execute(sql)
+        cur.fetchall()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_reviews_schema(n=N_DB_REVIEWS):
+    """Flat reviews table vs migrate_schema's partitioned, indexed one, built
+    in a scratch schema of the database load_to_postgres connects to"""
+    import load_to_postgres
+
+    print(f"\n=== reviews schema: flat vs partitioned + indexed, {n:,} rows ===")
+    conn = load_to_postgres.connect_db()
+    cur = conn.cursor()
+    cur.execute(f"DROP SCHEMA IF EXISTS {DB_BENCH_SCHEMA} CASCADE; CREATE SCHEMA {DB_BENCH_SCHEMA};")
+    cur.execute(f"SET search_path TO {DB_BENCH_SCHEMA}, public;")
+    conn.commit()
+    load_to_postgres.create_tables(conn)
+    load_to_postgres.load_banks(conn)
+
+    # generated server-side; about 1 review in 1000 mentions "timeout"
+    words = "'{app,good,bad,slow,transfer,login,crash,update,nice,worst,best,money,account,otp,balance,fast}'"
+    timed("generate rows", lambda: cur.execute(f"""
+        INSERT INTO reviews
+        SELECT 'r' || i, 1 + i % 3,
+               (SELECT string_agg(({words}::text[])[1 + (random() * 15)::int], ' ')
+                FROM generate_series(1, 3 + i % 12)) || CASE WHEN i % 1000 = 0 THEN ' timeout' ELSE '' END,
+               1 + i % 5, date '2019-01-01' + (i % 2500),
+               (ARRAY['positive', 'neutral', 'negative'])[1 + i % 3], random() * 2 - 1, 'synthetic', NULL
+        FROM generate_series(1, {n}) AS i;
+    """))
+    cur.execute("CREATE TABLE reviews_baseline AS TABLE reviews;")
+    cur.execute("ALTER TABLE reviews_baseline ADD PRIMARY KEY (review_id);")
+    cur.execute("ANALYZE reviews_baseline;")
+    conn.commit()
+    timed("migrate_schema", lambda: load_to_postgres.migrate_schema(conn))
+
+    for label, sql in SCHEMA_QUERIES.items():
+        flat = _best_query_time(cur, sql.format(table="reviews_baseline"))
+        indexed = _best_query_time(cur, sql.format(table="reviews"))
+        print(f"  {label:<24} flat {flat:7.3f}s   partitioned {indexed:7.3f}s   {flat / indexed:6.1f}x")
+
+    cur.execute(f"DROP SCHEMA {DB_BENCH_SCHEMA} CASCADE;")
+    conn.commit()
+    conn.close()
+
+
+BENCHMARKS = {
+    "clean_text": bench_clean_text,
+    "topic_startup": bench_topic_startup,
+    "reviews_schema": bench_reviews_schema,
+}
+
+
+def main():
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,42 @@
 import os
 import pandas as pd
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+from dedup_index import ReviewIndex
+from storage import write_dataset
+
+try:
+    import pyarrow  # noqa: F401  (only needed for the "pyarrow" string backend)
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
 # ---------------- CONFIG ----------------
 RAW_DIR = "data/raw"
 PROCESSED_DIR = "data/processed"
+STRING_BACKEND = "pyarrow" if HAS_PYARROW else "python"   # used by clean_texts
+PARALLEL = False                  # clean raw files on a process pool
+WORKERS = os.cpu_count() or 1
+CHUNK_ROWS = 100_000              # rows per task when a large file is split
+CHUNK_FILE_BYTES = 50_000_000     # files bigger than this are read in chunks
+GLOBAL_DEDUP = False              # skip reviews already cleaned by any earlier run
+INDEX_FILE = f"{PROCESSED_DIR}/review_index.sqlite"
+NEW_REVIEWS_FILE = f"{PROCESSED_DIR}/new_reviews.csv"   # this run's new rows only
 # ---------------------------------------
 
+# Every character Python's `re` counts as \s, spelled out so that pyarrow's
+# RE2 engine (where \s is ASCII-only) matches exactly the same set
+WHITESPACE = "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000"
+URL_PATTERN = f"http[^{WHITESPACE}]+"
+SPECIAL_PATTERN = f"[^a-zA-Z0-9{WHITESPACE}]"
+# Once special chars are gone, anything that is not alphanumeric is whitespace.
+# Only runs that actually change are matched: 2+ whitespace chars, or a lone
+# non-space one; replacing every single " " with " " would dominate the cost.
+SPACE_PATTERN = r"[^a-zA-Z0-9]{2,}|[^a-zA-Z0-9 ]"
+
 def clean_text(text):
     if not isinstance(text, str):
         return ""
@@ -17,9 +46,43 @@ def clean_text(text):
     text = re.sub(r"\s+", " ", text).strip()    # remove extra spaces
     return text
 
-def process_file(file_path):
-    df = pd.read_csv(file_path)
-    
+def clean_texts(texts, backend=STRING_BACKEND):
+    """Vectorized clean_text over a whole Series; gives the same strings as
+    texts.apply(clean_text). backend is "python" (object dtype, stdlib re)
+    or "pyarrow" (Arrow string array, RE2)."""
+    if texts.dtype == object:
+        texts = texts.where(texts.map(lambda v: isinstance(v, str)), "")
+    elif pd.api.types.is_string_dtype(texts.dtype):
+        texts = texts.fillna("")
+    else:
+        # no strings at all, e.g. an all-NaN column read as float
+        texts = pd.Series("", index=texts.index)
+
+    if backend == "pyarrow" and HAS_PYARROW:
+        texts = texts.astype("string[pyarrow]")
+    else:
+        texts = texts.astype(object)
+
+    texts = texts.str.lower()
+    texts = texts.str.replace(URL_PATTERN, "", regex=True)        # remove urls
+    texts = texts.str.replace(SPECIAL_PATTERN, "", regex=True)    # remove special chars
+    texts = texts.str.replace(SPACE_PATTERN, " ", regex=True)     # remove extra spaces (after special chars!)
+    return texts.str.strip()
+
+def bank_from_filename(file_path):
+    fname = os.path.basename(file_path).lower()
+
+    if "cbe" in fname:
+      return "CBE"
+    elif "abyssinia" in fname or "boa" in fname:
+      return "Abyssinia"
+    elif "dashen" in fname:
+      return "Dashen"
+    else:
+      return "Unknown"
+
+def clean_frame(df, bank):
+    """Clean one frame of raw scraper rows (a whole file or a single page)"""
     # Keep relevant columns
     cols = ['reviewId', 'userName', 'content', 'score', 'at']
     df = df[cols]
@@ -27,20 +90,11 @@ def process_file(file_path):
     # Rename columns
     df.columns = ['review_id', 'user', 'review', 'rating', 'date']
     
-    # Add bank column based on filename
-    fname = os.path.basename(file_path).lower()
-
-    if "cbe" in fname:
-      df["bank"] = "CBE"
-    elif "abyssinia" in fname or "boa" in fname:
-      df["bank"] = "Abyssinia"
-    elif "dashen" in fname:
-      df["bank"] = "Dashen"
-    else:
-      df["bank"] = "Unknown"
+    # Add bank column
+    df["bank"] = bank
 
     # Clean text
-    df['review'] = df['review'].apply(clean_text)
+    df['review'] = clean_texts(df['review'])
     
     # Normalize date
     df['date'] = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d')
@@ -51,10 +105,112 @@ def process_file(file_path):
     
     return df
 
+def process_file(file_path):
+    df = pd.read_csv(file_path)
+    return clean_frame(df, bank_from_filename(file_path))
+
+def append_cleaned(df, output_file):
+    """Append a cleaned chunk, writing the header only for a new file"""
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    df.to_csv(output_file, mode="a", index=False, header=not os.path.exists(output_file))
+
+def write_new_rows(df, output_file, index, new_file=NEW_REVIEWS_FILE):
+    """Append only reviews the index has not seen to output_file (and new_file),
+    then record them. Ids are indexed after the write, so a crash can at
+    worst repeat rows, never lose them."""
+    seen = pd.Series(index.contains(df['review_id']), index=df.index)
+    df = df[~seen].drop_duplicates(subset='review_id')
+    append_cleaned(df, output_file)
+    if new_file:
+        append_cleaned(df, new_file)
+    index.add(df['review_id'])
+    return df
+
+def open_index(output_file, new_file=NEW_REVIEWS_FILE, index_file=INDEX_FILE, rebuild=True):
+    """Open the dedup index for a run. An empty index next to an existing
+    output_file (dedup just turned on) means output_file starts over when
+    the caller rebuilds it from scratch (`rebuild`); otherwise the index is
+    seeded with the review_ids already in output_file, which is kept."""
+    index = ReviewIndex(index_file)
+    if len(index) == 0 and os.path.exists(output_file):
+        if rebuild:
+            os.remove(output_file)
+        else:
+            for chunk in pd.read_csv(output_file, usecols=['review_id'], chunksize=CHUNK_ROWS):
+                index.add(chunk['review_id'])
+    if new_file and os.path.exists(new_file):
+        os.remove(new_file)
+    return index
+
+def _clean_task(task):
+    """Worker entry point: task is (file_path, chunk); chunk is None for a whole file"""
+    file_path, chunk = task
+    if chunk is None:
+        return process_file(file_path)
+    return clean_frame(chunk, bank_from_filename(file_path))
+
+def iter_tasks(files, chunk_rows=CHUNK_ROWS, chunk_bytes=CHUNK_FILE_BYTES):
+    """Small files are handed out by path, large ones as `chunksize` chunks"""
+    for file_path in files:
+        if os.path.getsize(file_path) <= chunk_bytes:
+            yield file_path, None
+        else:
+            for chunk in pd.read_csv(file_path, chunksize=chunk_rows):
+                yield file_path, chunk
+
+def clean_parallel(files, output_file, workers=WORKERS, index=None):
+    """Clean files on a process pool and append each shard to output_file as it
+    finishes. Shards are written in task order, and at most 2 * workers tasks
+    are in flight so memory stays bounded. Duplicates are dropped per raw
+    file, as process_file does, or against `index` when one is given."""
+    if index is None and os.path.exists(output_file):
+        os.remove(output_file)
+
+    seen_ids = {}
+    total = 0
+
+    def write(file_path, shard):
+        nonlocal total
+        if index is not None:
+            total += len(write_new_rows(shard, output_file, index))
+            return
+        seen = seen_ids.setdefault(file_path, set())
+        shard = shard[~shard['review_id'].isin(seen)]
+        seen.update(shard['review_id'])
+        append_cleaned(shard, output_file)
+        total += len(shard)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for task in iter_tasks(files):
+            in_flight.append((task[0], pool.submit(_clean_task, task)))
+            if len(in_flight) >= 2 * workers:
+                file_path, future = in_flight.popleft()
+                write(file_path, future.result())
+        while in_flight:
+            file_path, future = in_flight.popleft()
+            write(file_path, future.result())
+
+    return total
+
 def main():
     os.makedirs(PROCESSED_DIR, exist_ok=True)
     
     all_files = [f"{RAW_DIR}/{f}" for f in os.listdir(RAW_DIR) if f.endswith(".csv")]
+
+    output_file = f"{PROCESSED_DIR}/cleaned_reviews.csv"
+    index = open_index(output_file) if GLOBAL_DEDUP else None
+
+    if PARALLEL:
+        total = clean_parallel(all_files, output_file, index=index)
+        print(f"Saved {total} {'new ' if index else ''}cleaned reviews → {output_file}")
+        return
+
+    if index is not None:
+        total = sum(len(write_new_rows(process_file(file), output_file, index)) for file in all_files)
+        print(f"Appended {total} new cleaned reviews → {output_file} (also in {NEW_REVIEWS_FILE})")
+        return
+
     cleaned_dfs = []
     
     for file in all_files:
@@ -63,9 +219,8 @@ def main():
     
     final_df = pd.concat(cleaned_dfs, ignore_index=True)
     
-    # Save cleaned CSV
-    output_file = f"{PROCESSED_DIR}/cleaned_reviews.csv"
-    final_df.to_csv(output_file, index=False)
+    # Save cleaned dataset (CSV and/or Parquet, see storage.STORAGE_FORMAT)
+    write_dataset(final_df, f"{PROCESSED_DIR}/cleaned_reviews")
     print(f"Saved cleaned reviews → {output_file}")
     print(final_df.head())
 
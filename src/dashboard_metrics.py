@@ -0,0 +1,92 @@
+import os
+import json
+import glob
+
+from storage import read_dataset, dataset_exists
+from aggregations import bank_metrics
+from issue_tagger import (IssueTagger, TAG_COLUMNS, DASHBOARD_ISSUES,
+                          RADAR_CATEGORIES, SPECIFIC_ISSUES, tag_reviews)
+
+# ---------------- CONFIG ----------------
+INPUT_DATASET = "data/processed/processed_reviews_sentiment"
+TAGGED_DATASET = "data/processed/processed_reviews_tagged"   # written by issue_tagger.py
+METRICS_FILE = "reports/dashboard_metrics.json"
+COLUMNS = ["bank", "review", "rating", "sentiment_label", "sentiment_score"]
+# ---------------------------------------
+
+
+def dataset_mtime(path):
+    """Newest modification time among a dataset's CSV / Parquet files"""
+    files = glob.glob(f"{path}.csv") + glob.glob(os.path.join(f"{path}.parquet", "**", "*"), recursive=True)
+    return max((os.path.getmtime(f) for f in files), default=0)
+
+
+def load_reviews():
+    """Tagged reviews, tagging on the fly when the tagged dataset is missing,
+    older than its input, or lacks some tag column"""
+    if dataset_exists(TAGGED_DATASET) and dataset_mtime(TAGGED_DATASET) >= dataset_mtime(INPUT_DATASET):
+        df = read_dataset(TAGGED_DATASET)
+    else:
+        df = read_dataset(INPUT_DATASET, columns=COLUMNS)
+    missing = {column: cats for column, cats in TAG_COLUMNS.items() if column not in df}
+    return tag_reviews(df, missing) if missing else df
+
+
+def compute_metrics(df):
+    """Everything the dashboard figures need, as plain JSON-able values"""
+    metrics = bank_metrics(df)
+    groups = df["bank"].astype(str)
+
+    radar = IssueTagger(RADAR_CATEGORIES).means(df["radar_tags"], df["rating"], groups)
+    # a bank with no review touching an area gets its overall average rating there
+    radar = radar.apply(lambda col: col.fillna(metrics["avg_rating"]))
+    specific = IssueTagger(SPECIFIC_ISSUES).counts(df["specific_tags"], groups)
+    dashboard = IssueTagger(DASHBOARD_ISSUES).counts(df["dashboard_tags"], groups)
+
+    best, worst = metrics["avg_rating"].idxmax(), metrics["avg_rating"].idxmin()
+    most_positive = metrics["positive_pct"].idxmax()
+    return {
+        "banks": metrics.reset_index().to_dict(orient="records"),
+        "radar": {
+            "categories": list(RADAR_CATEGORIES),
+            "scores": {bank: [round(v, 2) for v in row] for bank, row in radar.iterrows()},
+        },
+        "specific_issues": {bank: {k: int(v) for k, v in row.items()} for bank, row in specific.iterrows()},
+        "dashboard_issues": {bank: {k: int(v) for k, v in row.items()} for bank, row in dashboard.iterrows()},
+        "summary": {
+            "best_rating": {"bank": best, "value": round(metrics.loc[best, "avg_rating"], 2)},
+            "worst_rating": {"bank": worst, "value": round(metrics.loc[worst, "avg_rating"], 2)},
+            "best_positive": {"bank": most_positive, "value": round(metrics.loc[most_positive, "positive_pct"], 1)},
+            "top_issues": dashboard.sum().sort_values(ascending=False).index[:2].tolist(),
+            "focus": {bank: row.idxmax() for bank, row in dashboard.iterrows()},
+        },
+    }
+
+
+def save_metrics(result, path=METRICS_FILE):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, default=float)
+    os.replace(tmp_path, path)
+
+
+def load_metrics(path=METRICS_FILE):
+    """Dashboard metrics, recomputed first if the file is missing or older
+    than the review data it was computed from"""
+    newest_input = max(dataset_mtime(INPUT_DATASET), dataset_mtime(TAGGED_DATASET))
+    if not os.path.exists(path) or os.path.getmtime(path) < newest_input:
+        save_metrics(compute_metrics(load_reviews()), path)
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    df = load_reviews()
+    print(f"Computing dashboard metrics from {len(df)} reviews ...")
+    save_metrics(compute_metrics(df))
+    print("Saved:", METRICS_FILE)
+
+
+if __name__ == "__main__":
+    main()
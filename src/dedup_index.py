@@ -0,0 +1,49 @@
+import os
+import sqlite3
+import hashlib
+
+QUERY_BATCH = 500   # ids per IN (...) lookup, below SQLite's parameter limit
+
+
+def id_hash(review_id):
+    """Stable signed 64-bit hash of a review id (fits an SQLite INTEGER key)"""
+    digest = hashlib.blake2b(str(review_id).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class ReviewIndex:
+    """Persistent set of review_id hashes, stored as an SQLite primary key.
+
+    Lets cleaning skip reviews that an earlier run (or an earlier raw file)
+    has already produced, across all scrape dates.
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS seen (h INTEGER PRIMARY KEY) WITHOUT ROWID")
+        self.conn.commit()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def contains(self, review_ids):
+        """Return a list of booleans, True where the id is already indexed"""
+        hashes = [id_hash(r) for r in review_ids]
+        known = set()
+        for i in range(0, len(hashes), QUERY_BATCH):
+            part = hashes[i:i + QUERY_BATCH]
+            placeholders = ",".join("?" * len(part))
+            rows = self.conn.execute(f"SELECT h FROM seen WHERE h IN ({placeholders})", part)
+            known.update(h for (h,) in rows)
+        return [h in known for h in hashes]
+
+    def add(self, review_ids):
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO seen VALUES (?)",
+                                  ((id_hash(r),) for r in review_ids))
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,92 @@
+import os
+import json
+import numpy as np
+
+from dedup_index import id_hash
+
+# Layout of a store directory (one per encoder model):
+#   vectors.f16  raw float16 rows, appended, read back memory-mapped
+#   keys.i64     raw int64 (review_id hash, text hash) pair per row
+#   meta.json    {"model": ..., "dim": ...}
+
+
+def store_dir(root, model_name):
+    return os.path.join(root, model_name.replace("/", "__"))
+
+
+class EmbeddingStore:
+    """Append-only float16 embedding store keyed by review_id.
+
+    Like LemmaCache it keeps a hash of the text each vector was computed
+    from, so an edited review is encoded again; the newest row wins.
+    """
+
+    def __init__(self, root, model_name):
+        self.dir = store_dir(root, model_name)
+        os.makedirs(self.dir, exist_ok=True)
+        self.model_name = model_name
+        self.vectors_file = os.path.join(self.dir, "vectors.f16")
+        self.keys_file = os.path.join(self.dir, "keys.i64")
+        self.meta_file = os.path.join(self.dir, "meta.json")
+        self.dim = None
+        if os.path.exists(self.meta_file):
+            with open(self.meta_file, encoding="utf-8") as f:
+                self.dim = json.load(f)["dim"]
+            # drop vectors whose keys were never written (interrupted append)
+            expected = len(self) * self.dim * 2
+            if os.path.exists(self.vectors_file) and os.path.getsize(self.vectors_file) > expected:
+                os.truncate(self.vectors_file, expected)
+        self._index = None
+
+    def __len__(self):
+        if not os.path.exists(self.keys_file):
+            return 0
+        return os.path.getsize(self.keys_file) // 16
+
+    def keys(self):
+        n = len(self)
+        if n == 0:
+            return np.empty((0, 2), dtype=np.int64)
+        return np.memmap(self.keys_file, dtype=np.int64, mode="r", shape=(n, 2))
+
+    def vectors(self):
+        """(rows, dim) float16 memory map over every stored vector"""
+        n = len(self)
+        if n == 0:
+            return np.empty((0, self.dim or 0), dtype=np.float16)
+        return np.memmap(self.vectors_file, dtype=np.float16, mode="r", shape=(n, self.dim))
+
+    def lookup(self, review_ids, texts):
+        """Row of each review's vector, -1 where missing or computed from other text"""
+        wanted_ids = np.array([id_hash(r) for r in review_ids], dtype=np.int64)
+        wanted_text = np.array([id_hash(t) for t in texts], dtype=np.int64)
+        if self._index is None:
+            keys = np.array(self.keys())
+            order = np.argsort(keys[:, 0], kind="stable")
+            self._index = keys, order, keys[order, 0]
+        keys, order, sorted_ids = self._index
+        if len(keys) == 0:
+            return np.full(len(wanted_ids), -1, dtype=np.int64)
+
+        # side="right" - 1 lands on the last (newest) row stored for an id
+        pos = np.searchsorted(sorted_ids, wanted_ids, side="right") - 1
+        rows = order[pos.clip(0)]
+        hit = (pos >= 0) & (keys[rows, 0] == wanted_ids) & (keys[rows, 1] == wanted_text)
+        return np.where(hit, rows, -1)
+
+    def append(self, review_ids, texts, vectors):
+        vectors = np.asarray(vectors, dtype=np.float16)
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            with open(self.meta_file, "w", encoding="utf-8") as f:
+                json.dump({"model": self.model_name, "dim": self.dim}, f)
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"store holds {self.dim}-d vectors, got {vectors.shape[1]}-d")
+
+        keys = np.array([(id_hash(r), id_hash(t)) for r, t in zip(review_ids, texts)], dtype=np.int64)
+        # vectors first: a crash in between leaves extra vectors, never keys without one
+        with open(self.vectors_file, "ab") as f:
+            f.write(np.ascontiguousarray(vectors).tobytes())
+        with open(self.keys_file, "ab") as f:
+            f.write(keys.tobytes())
+        self._index = None
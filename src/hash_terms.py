@@ -0,0 +1,43 @@
+from collections import Counter
+
+import numpy as np
+from sklearn.feature_extraction import FeatureHasher
+
+# ---------------- CONFIG ----------------
+MAX_LOOKUP_TERMS = 200_000   # terms remembered for the inverse-hash lookup
+# ---------------------------------------
+
+
+class HashTermLookup:
+    """Bounded inverse lookup from HashingVectorizer columns to readable terms.
+
+    Term counts are accumulated chunk by chunk; whenever more than twice
+    `max_terms` distinct terms are held, only the `max_terms` most frequent
+    survive. Each column is then named after its most frequent term.
+    """
+
+    def __init__(self, vectorizer, max_terms=MAX_LOOKUP_TERMS):
+        self.vectorizer = vectorizer
+        self.analyzer = vectorizer.build_analyzer()
+        self.max_terms = max_terms
+        self.counts = Counter()
+
+    def update(self, docs):
+        for doc in docs:
+            self.counts.update(self.analyzer(doc))
+        if len(self.counts) > 2 * self.max_terms:
+            self.counts = Counter(dict(self.counts.most_common(self.max_terms)))
+
+    def feature_names(self):
+        """Term for every hash column, "hash_<col>" where none was seen"""
+        names = np.array([f"hash_{i}" for i in range(self.vectorizer.n_features)], dtype=object)
+        terms = [t for t, _ in self.counts.most_common(self.max_terms)]
+        if terms:
+            # same hashing HashingVectorizer applies to each analyzed term
+            hasher = FeatureHasher(n_features=self.vectorizer.n_features, input_type="string",
+                                   alternate_sign=False)
+            cols = hasher.transform([[t] for t in terms]).indices
+            # most_common is descending, so assign in reverse to let the top term win
+            for col, term in zip(cols[::-1], terms[::-1]):
+                names[col] = term
+        return names
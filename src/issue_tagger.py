@@ -0,0 +1,178 @@
+import re
+import numpy as np
+import pandas as pd
+
+from storage import read_dataset, write_dataset
+
+# ---------------- CONFIG ----------------
+INPUT_DATASET = "data/processed/processed_reviews_sentiment"
+OUTPUT_DATASET = "data/processed/processed_reviews_tagged"
+# ---------------------------------------
+
+# Specific issues reported per bank by Insights.py
+COMMON_ISSUES = {
+    'Login/Account Issues': ['login', 'password', 'account', 'access', 'verification'],
+    'Transaction Problems': ['transfer', 'payment', 'transaction', 'money', 'send'],
+    'App Performance': ['crash', 'freeze', 'hang', 'not working', 'stop'],
+    'Speed Issues': ['slow', 'loading', 'wait', 'time', 'delay'],
+    'Update Problems': ['update', 'version', 'new version', 'upgrade'],
+    'Customer Support': ['support', 'help', 'service', 'response']
+}
+
+# Issue categories on the visualize.py dashboard
+DASHBOARD_ISSUES = {
+    'Technical': ['crash', 'error', 'bug', 'not working', 'freeze'],
+    'Performance': ['slow', 'loading', 'wait', 'delay', 'speed'],
+    'Login/Account': ['login', 'password', 'account', 'access', 'verification'],
+    'Usability': ['difficult', 'complex', 'hard to use', 'confusing', 'interface']
+}
+
+# Themes for driver / pain-point phrases; the first matching theme wins
+THEMES = {
+    'Technical Issues': ['crash', 'bug', 'error', 'issue', 'problem', 'working', 'work', 'fix', 'update'],
+    'Performance': ['slow', 'lag', 'loading', 'speed', 'time', 'wait', 'fast', 'quick'],
+    'Usability': ['easy', 'hard', 'difficult', 'simple', 'complex', 'interface', 'design', 'user'],
+    'Features': ['feature', 'transfer', 'payment', 'login', 'password', 'account', 'balance'],
+    'Customer Service': ['support', 'service', 'help', 'response', 'contact'],
+    'Security': ['secure', 'safe', 'trust', 'password', 'login', 'verification'],
+    'General Sentiment': ['best', 'worst', 'nice', 'great', 'good', 'bad', 'super', 'excellent', 'terrible']
+}
+
+# Product areas scored on the radar chart (mean rating of reviews mentioning them)
+RADAR_CATEGORIES = {
+    'App Stability': ['crash', 'bug', 'error', 'not working', 'freeze', 'hang', 'stop'],
+    'Speed/Performance': ['slow', 'loading', 'lag', 'wait', 'delay', 'speed', 'fast', 'quick'],
+    'User Interface': ['interface', 'design', 'easy', 'difficult', 'confusing', 'simple', 'user friendly'],
+    'Features': ['feature', 'transfer', 'payment', 'balance', 'bill', 'account'],
+    'Customer Support': ['support', 'help', 'service', 'response', 'contact', 'branch']
+}
+
+# Specific issues counted on the issues heatmap
+SPECIFIC_ISSUES = {
+    'Mobile Banking Issues': ['mobile banking'],
+    'Developer Options': ['developer option'],
+    'Worst Ever': ['worst'],
+    'Speed Problems': ['slow', 'loading', 'lag', 'delay'],
+    'App Crashes': ['crash', 'freeze', 'not working'],
+    'SIM Card Problems': ['sim card'],
+    'Branch Issues': ['branch'],
+    'Bill Payment': ['bill']
+}
+
+# Tag columns written by this stage: column name -> category set
+TAG_COLUMNS = {"issue_tags": COMMON_ISSUES, "dashboard_tags": DASHBOARD_ISSUES,
+               "radar_tags": RADAR_CATEGORIES, "specific_tags": SPECIFIC_ISSUES}
+
+
+def trie_pattern(words):
+    """Regex matching any of `words`, factored as a prefix trie so each
+    position is tried against one branch per character instead of every
+    word in turn. Greedy optionals make it prefer the longest word."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        end = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not end:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if end else group
+
+    return build(trie)
+
+
+class IssueTagger:
+    """Tags text with a bitmask of the categories whose keywords it contains.
+
+    All keywords are compiled into one trie-shaped regex, so each review is
+    lowercased once and scanned once. Matching is plain substring
+    containment, like `keyword in review.lower()`: a zero-width lookahead
+    tries every position, and the longest keyword found there also implies
+    every keyword that is a prefix of it. Bit i stands for the i-th category.
+    """
+
+    def __init__(self, categories):
+        self.categories = list(categories)
+        masks = {}
+        for bit, keywords in enumerate(categories.values()):
+            for kw in keywords:
+                masks[kw.lower()] = masks.get(kw.lower(), 0) | (1 << bit)
+        self.masks = {kw: 0 for kw in masks}
+        for kw in masks:
+            for other, mask in masks.items():
+                if kw.startswith(other):
+                    self.masks[kw] |= mask
+        self.pattern = re.compile(f"(?=({trie_pattern(masks)}))")
+        self.all = (1 << len(self.categories)) - 1
+
+    def tag_one(self, text):
+        mask = 0
+        for match in self.pattern.finditer(text.lower()):
+            mask |= self.masks[match.group(1)]
+            if mask == self.all:
+                break
+        return mask
+
+    def tag(self, texts):
+        """int64 bitmask per text (missing text gets 0)"""
+        return np.fromiter((self.tag_one(t) if isinstance(t, str) else 0 for t in texts),
+                           dtype=np.int64, count=len(texts))
+
+    def has(self, tags, category):
+        """Boolean array: which tags include `category`"""
+        return (np.asarray(tags) >> self.categories.index(category)) & 1 == 1
+
+    def first(self, text, default='Other'):
+        """Name of the first category (in definition order) the text matches"""
+        mask = self.tag_one(text)
+        if not mask:
+            return default
+        return self.categories[(mask & -mask).bit_length() - 1]
+
+    def bits(self, tags):
+        """(n, categories) 0/1 matrix"""
+        return (np.asarray(tags, dtype=np.int64)[:, None] >> np.arange(len(self.categories))) & 1
+
+    def counts(self, tags, groups):
+        """groups x categories table of how many tags include each category"""
+        return pd.DataFrame(self.bits(tags), columns=self.categories) \
+            .groupby(np.asarray(groups), sort=False).sum()
+
+    def means(self, tags, values, groups):
+        """groups x categories mean of `values` over the rows tagged with each
+        category (NaN where a group has none)"""
+        bits = self.bits(tags)
+        weighted = pd.DataFrame(bits * np.asarray(values, dtype=float)[:, None], columns=self.categories)
+        sums = weighted.groupby(np.asarray(groups), sort=False).sum()
+        counts = self.counts(tags, groups)
+        return sums / counts.where(counts > 0)
+
+
+def tag_reviews(df, tag_columns=TAG_COLUMNS):
+    """Copy of df with one bitmask column per category set"""
+    df = df.copy()
+    for column, categories in tag_columns.items():
+        df[column] = IssueTagger(categories).tag(df["review"])
+    return df
+
+
+def main():
+    df = read_dataset(INPUT_DATASET)
+    print(f"Tagging {len(df)} reviews ...")
+    tagged = tag_reviews(df)
+    write_dataset(tagged, OUTPUT_DATASET)
+    for column, categories in TAG_COLUMNS.items():
+        counts = IssueTagger(categories).counts(tagged[column], tagged["bank"].astype(str))
+        print(f"\n{column}:\n{counts}")
+    print("Saved:", OUTPUT_DATASET)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import os
+import joblib
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from dedup_index import id_hash
+
+
+def state_path(model_dir, bank_name):
+    return os.path.join(model_dir, f"{bank_name}_lda.joblib")
+
+
+def load_state(model_dir, bank_name):
+    """Saved {vectorizer, lda, seen, baseline_perplexity} for a bank, or None"""
+    path = state_path(model_dir, bank_name)
+    if not os.path.exists(path):
+        return None
+    return joblib.load(path)
+
+
+def save_state(model_dir, bank_name, state):
+    os.makedirs(model_dir, exist_ok=True)
+    path = state_path(model_dir, bank_name)
+    tmp_path = f"{path}.tmp"
+    joblib.dump(state, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def hash_ids(review_ids):
+    return np.array([id_hash(r) for r in review_ids], dtype=np.int64)
+
+
+def oov_rate(docs, vocabulary):
+    """Share of unigram tokens in docs that the fitted vocabulary does not know"""
+    total = unknown = 0
+    for doc in docs:
+        tokens = doc.split()
+        total += len(tokens)
+        unknown += sum(1 for t in tokens if t not in vocabulary)
+    return unknown / total if total else 0.0
+
+
+def topic_word_matrix(lda, features, vocab):
+    """Normalized topic-word weights projected onto a shared vocab list"""
+    position = {term: i for i, term in enumerate(vocab)}
+    cols = [position[f] for f in features]
+    weights = np.zeros((lda.components_.shape[0], len(vocab)))
+    weights[:, cols] = lda.components_ / lda.components_.sum(axis=1, keepdims=True)
+    return weights
+
+
+def align_topics(old_lda, old_features, new_lda, new_features):
+    """Reorder new_lda's topics in place so each keeps the id of the most
+    similar old topic (cosine similarity, optimal one-to-one matching)"""
+    vocab = sorted(set(old_features) | set(new_features))
+    old_w = topic_word_matrix(old_lda, old_features, vocab)
+    new_w = topic_word_matrix(new_lda, new_features, vocab)
+    old_w /= np.linalg.norm(old_w, axis=1, keepdims=True)
+    new_w /= np.linalg.norm(new_w, axis=1, keepdims=True)
+
+    old_idx, new_idx = linear_sum_assignment(-(old_w @ new_w.T))
+    order = new_idx[np.argsort(old_idx)]
+    # exp_dirichlet_component_ is a row-wise function of components_
+    new_lda.components_ = new_lda.components_[order]
+    new_lda.exp_dirichlet_component_ = new_lda.exp_dirichlet_component_[order]
+    return order
@@ -0,0 +1,53 @@
+import os
+import sqlite3
+
+from dedup_index import id_hash
+
+QUERY_BATCH = 500   # ids per IN (...) lookup, below SQLite's parameter limit
+
+
+class LemmaCache:
+    """Lemmatized token strings stored per review_id.
+
+    Each row also keeps a hash of the text it was computed from, so an
+    edited review is lemmatized again instead of served stale.
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS lemmas (
+                review_id TEXT PRIMARY KEY,
+                text_hash INTEGER,
+                tokens TEXT
+            )
+        """)
+        self.conn.commit()
+
+    def get_many(self, review_ids, texts):
+        """Return {review_id: tokens} for ids cached with the same text"""
+        wanted = {str(r): id_hash(t) for r, t in zip(review_ids, texts)}
+        ids = list(wanted)
+        found = {}
+        for i in range(0, len(ids), QUERY_BATCH):
+            part = ids[i:i + QUERY_BATCH]
+            placeholders = ",".join("?" * len(part))
+            rows = self.conn.execute(
+                f"SELECT review_id, text_hash, tokens FROM lemmas WHERE review_id IN ({placeholders})", part
+            )
+            for review_id, text_hash, tokens in rows:
+                if wanted[review_id] == text_hash:
+                    found[review_id] = tokens
+        return found
+
+    def put_many(self, review_ids, texts, tokens):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO lemmas VALUES (?, ?, ?)",
+                ((str(r), id_hash(t), tok) for r, t, tok in zip(review_ids, texts, tokens))
+            )
+
+    def close(self):
+        self.conn.close()
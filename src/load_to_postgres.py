@@ -1,5 +1,14 @@
+import io
+import os
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import psycopg2
 import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.engine import URL
+
+from storage import read_dataset
 
 DB_NAME = "fintech_reviews"
 DB_USER = "postgres"
@@ -8,7 +17,37 @@ DB_HOST = "localhost"
 DB_PORT = 5432
 
 
-INPUT_FILE = "data/processed/processed_reviews_sentiment.csv"
+INPUT_DATASET = "data/processed/processed_reviews_sentiment"
+NEW_ONLY = False            # load only the rows sentiment_analysis.py scored in its NEW_ONLY run
+NEW_INPUT_DATASET = "data/processed/new_reviews_sentiment"
+INPUT_COLUMNS = ["review_id", "bank", "review", "rating", "date",
+                 "sentiment_label", "sentiment_score"]
+REVIEW_COLUMNS = ["review_id", "bank_id", "review_text", "rating",
+                  "review_date", "sentiment_label", "sentiment_score", "source",
+                  "content_hash"]
+SOURCE = "google_play"
+BULK_LOAD = True            # COPY into a staging table + one INSERT ... SELECT
+COPY_CHUNK_ROWS = 100_000   # rows buffered in memory per COPY call
+UPSERT = False              # also update stored reviews whose content changed
+UPSERT_BATCH_ROWS = 50_000  # changed rows per INSERT ... ON CONFLICT DO UPDATE
+FETCH_ROWS = 100_000        # rows per round trip when reading stored hashes
+DATABASE_URL = os.environ.get("DATABASE_URL")   # PostgreSQL URL overriding DB_* for the pooled engine
+PARALLEL_LOAD = False       # load partitions concurrently, one pooled connection each (insert only, no UPSERT)
+LOAD_WORKERS = 4
+POOL_SIZE = LOAD_WORKERS
+PARTITION_BY = "bank"       # "bank" or "month"
+PARTITIONED_SCHEMA = False  # reviews range-partitioned by review_date, with analytics indexes
+
+REVIEWS_DDL = """
+            review_id TEXT NOT NULL,
+            bank_id INTEGER REFERENCES banks(bank_id),
+            review_text TEXT,
+            rating INTEGER,
+            review_date DATE,
+            sentiment_label TEXT,
+            sentiment_score FLOAT,
+            source TEXT,
+            content_hash BIGINT"""
 
 def connect_db():
     return psycopg2.connect(
@@ -19,6 +58,13 @@ def connect_db():
         port=DB_PORT
     )
 
+def get_engine(url=None, pool_size=POOL_SIZE):
+    """SQLAlchemy engine whose pool hands each loader worker its own connection"""
+    if url is None:
+        url = DATABASE_URL or URL.create("postgresql+psycopg2", username=DB_USER, password=DB_PASSWORD,
+                                         host=DB_HOST, port=DB_PORT, database=DB_NAME)
+    return create_engine(url, pool_size=pool_size, max_overflow=0, pool_pre_ping=True)
+
 def create_tables(conn):
     cur = conn.cursor()
 
@@ -30,22 +76,76 @@ def create_tables(conn):
         );
     """)
 
-    cur.execute("""
+    cur.execute(f"""
         CREATE TABLE IF NOT EXISTS reviews (
-            review_id TEXT PRIMARY KEY,
-            bank_id INTEGER REFERENCES banks(bank_id),
-            review_text TEXT,
-            rating INTEGER,
-            review_date DATE,
-            sentiment_label TEXT,
-            sentiment_score FLOAT,
-            source TEXT
+            {REVIEWS_DDL},
+            PRIMARY KEY (review_id)
         );
     """)
+    # tables created before content hashes existed
+    cur.execute("ALTER TABLE reviews ADD COLUMN IF NOT EXISTS content_hash BIGINT;")
 
     conn.commit()
     cur.close()
 
+def conflict_key(cur):
+    """Unique key for ON CONFLICT, read from the table itself: a partitioned
+    table's key must include review_date"""
+    return "review_id, review_date" if is_partitioned(cur) else "review_id"
+
+def is_partitioned(cur, table="reviews"):
+    cur.execute("""
+        SELECT 1 FROM pg_partitioned_table p
+        JOIN pg_class c ON c.oid = p.partrelid
+        WHERE c.oid = to_regclass(%s);
+    """, (table,))
+    return cur.fetchone() is not None
+
+def ensure_partitions(cur, first_year, last_year):
+    """One reviews_yYYYY partition per year, plus a default for anything outside"""
+    for year in range(first_year, last_year + 1):
+        cur.execute(f"""
+            CREATE TABLE IF NOT EXISTS reviews_y{year} PARTITION OF reviews
+            FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01');
+        """)
+    cur.execute("CREATE TABLE IF NOT EXISTS reviews_default PARTITION OF reviews DEFAULT;")
+
+def migrate_schema(conn, first_year=None, last_year=None):
+    """Turn a flat reviews table into one range-partitioned by review_date
+    and add the indexes per-bank/date/sentiment and text queries need.
+    Safe to re-run: an already partitioned table only gets missing pieces."""
+    cur = conn.cursor()
+    last_year = last_year or date.today().year + 1
+    if not is_partitioned(cur):
+        cur.execute("ALTER TABLE reviews RENAME TO reviews_flat;")
+        cur.execute("ALTER TABLE reviews_flat RENAME CONSTRAINT reviews_pkey TO reviews_flat_pkey;")
+        cur.execute(f"""
+            CREATE TABLE reviews (
+                {REVIEWS_DDL},
+                PRIMARY KEY (review_id, review_date)
+            ) PARTITION BY RANGE (review_date);
+        """)
+        cur.execute("SELECT EXTRACT(YEAR FROM MIN(review_date))::int FROM reviews_flat;")
+        oldest = cur.fetchone()[0]
+        ensure_partitions(cur, first_year or oldest or last_year - 1, last_year)
+        cur.execute("INSERT INTO reviews SELECT * FROM reviews_flat;")
+        cur.execute("DROP TABLE reviews_flat;")
+    else:
+        ensure_partitions(cur, first_year or last_year - 1, last_year)
+
+    # created on the parent, so every current and future partition gets them
+    cur.execute("CREATE INDEX IF NOT EXISTS reviews_bank_date_idx ON reviews (bank_id, review_date);")
+    cur.execute("CREATE INDEX IF NOT EXISTS reviews_bank_label_idx ON reviews (bank_id, sentiment_label);")
+    cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    cur.execute("CREATE INDEX IF NOT EXISTS reviews_text_trgm_idx ON reviews USING gin (review_text gin_trgm_ops);")
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS reviews_text_fts_idx ON reviews
+        USING gin (to_tsvector('english', coalesce(review_text, '')));
+    """)
+    cur.execute("ANALYZE reviews;")
+    conn.commit()
+    cur.close()
+
 def load_banks(conn):
     cur = conn.cursor()
     banks = [("CBE", "Commercial Bank of Ethiopia App"),
@@ -61,22 +161,209 @@ def load_banks(conn):
     conn.commit()
     cur.close()
 
-def load_reviews(conn):
-    df = pd.read_csv(INPUT_FILE)
+def bank_ids(conn):
+    """{bank_name: bank_id}, read once instead of a subquery per review"""
     cur = conn.cursor()
+    cur.execute("SELECT bank_name, bank_id FROM banks;")
+    ids = dict(cur.fetchall())
+    cur.close()
+    return ids
+
+def review_rows(df, ids):
+    """df laid out like the reviews table (REVIEW_COLUMNS order)"""
+    rows = pd.DataFrame({
+        "review_id": df["review_id"].astype(str),
+        # unknown banks get NULL, as the old per-row subquery did
+        "bank_id": df["bank"].astype(str).map(ids).astype("Int64"),
+        "review_text": df["review"],
+        "rating": pd.to_numeric(df["rating"]).astype("Int64"),
+        "review_date": pd.to_datetime(df["date"]).dt.date,
+        "sentiment_label": df["sentiment_label"],
+        "sentiment_score": df["sentiment_score"],
+        "source": SOURCE,
+    })
+    rows["content_hash"] = content_hashes(rows)
+    return rows[REVIEW_COLUMNS]
+
+def content_hashes(rows):
+    """Signed 64-bit hash of every stored field except the key, per row"""
+    fields = rows.drop(columns=["review_id", "content_hash"], errors="ignore")
+    return pd.util.hash_pandas_object(fields, index=False).to_numpy().view(np.int64)
+
+def copy_rows(cur, rows, table, chunk_rows=COPY_CHUNK_ROWS):
+    """Stream a DataFrame into `table` with COPY FROM STDIN, chunk by chunk"""
+    columns = ", ".join(rows.columns)
+    for start in range(0, len(rows), chunk_rows):
+        buf = io.StringIO()
+        rows.iloc[start:start + chunk_rows].to_csv(buf, index=False, header=False)
+        buf.seek(0)
+        cur.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)", buf)
+
+def load_reviews_bulk(conn, df):
+    """COPY every review into a temp staging table, then move them into
+    reviews with a single INSERT ... SELECT. Returns the number inserted."""
+    # NOT EXISTS only sees stored rows, so a review staged twice (e.g. under two
+    # dates in the partitioned schema) would otherwise be inserted twice
+    rows = review_rows(df, bank_ids(conn)).drop_duplicates("review_id", keep="last")
+    return insert_rows_bulk(conn, rows)
+
+def insert_rows_bulk(conn, rows):
+    columns = ", ".join(REVIEW_COLUMNS)
+    cur = conn.cursor()
+    cur.execute("""
+        CREATE TEMP TABLE reviews_staging
+        (LIKE reviews INCLUDING DEFAULTS) ON COMMIT DROP;
+    """)
+    copy_rows(cur, rows, "reviews_staging")
+    # review_id alone is not unique in the partitioned schema, so check it explicitly
+    cur.execute(f"""
+        INSERT INTO reviews ({columns})
+        SELECT {columns} FROM reviews_staging s
+        WHERE NOT EXISTS (SELECT 1 FROM reviews r WHERE r.review_id = s.review_id)
+        ON CONFLICT ({conflict_key(cur)}) DO NOTHING;
+    """)
+    inserted = cur.rowcount
+    conn.commit()
+    cur.close()
+    return inserted
+
+def stored_hashes(conn):
+    """Series review_id -> content_hash (NA for rows loaded without one)"""
+    cur = conn.cursor(name="stored_hashes")   # server-side: fetched FETCH_ROWS at a time
+    cur.itersize = FETCH_ROWS
+    cur.execute("SELECT review_id, content_hash FROM reviews;")
+    stored = pd.DataFrame(list(cur), columns=["review_id", "content_hash"])
+    cur.close()
+    hashes = stored.set_index("review_id")["content_hash"].astype("Int64")
+    # a review stored under several dates gets NA, so the upsert rewrites it
+    dup = hashes.index.duplicated(keep=False)
+    hashes = hashes.mask(dup)
+    return hashes[~hashes.index.duplicated()]
+
+def upsert_reviews(conn, df, batch_rows=UPSERT_BATCH_ROWS):
+    """Insert new reviews and update those whose content hash changed; only
+    those rows are sent. In a table partitioned by review_date, an edit that
+    moved a review's date replaces the old row instead of adding a second
+    one. Returns {"inserted", "updated", "unchanged"}."""
+    rows = review_rows(df, bank_ids(conn)).drop_duplicates("review_id", keep="last")
+    stored = stored_hashes(conn)
+    is_new = ~rows["review_id"].isin(stored.index)
+    old_hash = rows["review_id"].map(stored)
+    changed = ~is_new & (old_hash != rows["content_hash"]).fillna(True)
+    send = rows[is_new | changed]
+
+    columns = ", ".join(REVIEW_COLUMNS)
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in REVIEW_COLUMNS if c != "review_id")
+    cur = conn.cursor()
+    partitioned = is_partitioned(cur)
+    key = conflict_key(cur)
+    cur.execute("""
+        CREATE TEMP TABLE reviews_staging
+        (LIKE reviews INCLUDING DEFAULTS) ON COMMIT DROP;
+    """)
+    for start in range(0, len(send), batch_rows):
+        copy_rows(cur, send.iloc[start:start + batch_rows], "reviews_staging")
+        if partitioned:
+            cur.execute("""
+                DELETE FROM reviews r USING reviews_staging s
+                WHERE r.review_id = s.review_id
+                  AND r.review_date IS DISTINCT FROM s.review_date;
+            """)
+        cur.execute(f"""
+            INSERT INTO reviews ({columns})
+            SELECT {columns} FROM reviews_staging
+            ON CONFLICT ({key}) DO UPDATE SET {updates};
+        """)
+        cur.execute("TRUNCATE reviews_staging;")
+    conn.commit()
+    cur.close()
+    return {"inserted": int(is_new.sum()), "updated": int(changed.sum()),
+            "unchanged": int(len(rows) - is_new.sum() - changed.sum())}
+
+def insert_rows_plain(conn, rows):
+    """DB-API executemany fallback for engines without COPY. Only
+    parallel_load_reviews uses it, e.g. to exercise the loader against a
+    SQLite file whose reviews table already exists; main() needs PostgreSQL."""
+    columns = ", ".join(REVIEW_COLUMNS)
+    placeholders = ", ".join("?" * len(REVIEW_COLUMNS))
+    values = rows.astype(object).where(rows.notna(), None).itertuples(index=False, name=None)
+    cur = conn.cursor()
+    cur.executemany(f"""
+        INSERT INTO reviews ({columns}) VALUES ({placeholders})
+        ON CONFLICT (review_id) DO NOTHING;
+    """, list(values))
+    inserted = cur.rowcount
+    conn.commit()
+    cur.close()
+    return inserted
+
+def partition_rows(rows, by=PARTITION_BY):
+    """Split review rows into independent chunks, one per bank or per month"""
+    if by == "bank":
+        keys = rows["bank_id"]
+    elif by == "month":
+        keys = pd.to_datetime(rows["review_date"]).dt.strftime("%Y-%m")
+    else:
+        raise ValueError(f"unknown PARTITION_BY: {by!r}")
+    return [part for _, part in rows.groupby(keys, sort=False, dropna=False)]
+
+def load_partition(engine, rows):
+    """Worker: insert one partition over its own pooled connection"""
+    conn = engine.raw_connection()
+    try:
+        if engine.dialect.name == "postgresql":
+            return insert_rows_bulk(conn, rows)
+        return insert_rows_plain(conn, rows)
+    finally:
+        conn.close()   # back to the pool
+
+def parallel_load_reviews(engine, df, workers=LOAD_WORKERS, by=PARTITION_BY):
+    """Insert new reviews with `workers` concurrent COPY streams, one
+    partition (bank or month) per task. Returns the number inserted.
+    The caller must not hold a pooled connection meanwhile: every worker
+    needs one, and `workers` may not exceed the pool size."""
+    if workers > engine.pool.size():
+        raise ValueError(f"{workers} workers need {workers} pooled connections, "
+                         f"the pool holds {engine.pool.size()}")
+    conn = engine.raw_connection()
+    try:
+        ids = bank_ids(conn)
+    finally:
+        conn.close()
+    # one row per review_id, so concurrent partitions never race on the same key
+    rows = review_rows(df, ids).drop_duplicates("review_id", keep="last")
+    parts = partition_rows(rows, by)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(lambda part: load_partition(engine, part), parts))
+
+def read_reviews():
+    return read_dataset(NEW_INPUT_DATASET if NEW_ONLY else INPUT_DATASET, columns=INPUT_COLUMNS)
+
+def load_reviews(conn, bulk=BULK_LOAD, upsert=UPSERT):
+    df = read_reviews()
+    if upsert:
+        counts = upsert_reviews(conn, df)
+        print("  {inserted} inserted, {updated} updated, {unchanged} unchanged".format(**counts))
+        return
+    if bulk:
+        inserted = load_reviews_bulk(conn, df)
+        print(f"  {inserted} of {len(df)} reviews inserted")
+        return
+    cur = conn.cursor()
+    key = conflict_key(cur)
 
     for _, row in df.iterrows():
-        cur.execute("""
+        cur.execute(f"""
             INSERT INTO reviews(
                 review_id, bank_id, review_text, rating,
                 review_date, sentiment_label, sentiment_score, source
             )
-            VALUES (
+            SELECT
                 %s,
                 (SELECT bank_id FROM banks WHERE bank_name=%s),
                 %s, %s, %s, %s, %s, %s
-            )
-            ON CONFLICT (review_id) DO NOTHING;
+            WHERE NOT EXISTS (SELECT 1 FROM reviews WHERE review_id = %s)
+            ON CONFLICT ({key}) DO NOTHING;
         """, (
             row["review_id"],
             row["bank"],
@@ -85,26 +372,45 @@ def load_reviews(conn):
             row["date"],
             row["sentiment_label"],
             row["sentiment_score"],
-            "google_play"
+            SOURCE,
+            row["review_id"]
         ))
 
     conn.commit()
     cur.close()
 
 def main():
+    if PARALLEL_LOAD and UPSERT:
+        raise ValueError("PARALLEL_LOAD only inserts new reviews; turn it off to use UPSERT")
+
     print("Connecting to PostgreSQL...")
-    conn = connect_db()
+    if PARALLEL_LOAD:
+        engine = get_engine()
+        if engine.dialect.name != "postgresql":
+            raise ValueError(f"main() needs PostgreSQL, DATABASE_URL points to {engine.dialect.name}")
+        conn = engine.raw_connection()
+    else:
+        conn = connect_db()
 
     print("Creating tables...")
     create_tables(conn)
+    if PARTITIONED_SCHEMA:
+        print("Migrating reviews to the partitioned schema...")
+        migrate_schema(conn)
 
     print("Inserting banks...")
     load_banks(conn)
 
     print("Inserting reviews...")
-    load_reviews(conn)
+    if PARALLEL_LOAD:
+        conn.close()   # back to the pool, which has exactly one connection per worker
+        df = read_reviews()
+        inserted = parallel_load_reviews(engine, df)
+        print(f"  {inserted} of {len(df)} reviews inserted by {LOAD_WORKERS} workers")
+    else:
+        load_reviews(conn)
+        conn.close()
 
-    conn.close()
     print("✅ DONE — Data Loaded Successfully!")
 
 if __name__ == "__main__":
@@ -0,0 +1,46 @@
+import threading
+
+# ---------------- CONFIG ----------------
+DEFAULT_MODEL = "en_core_web_sm"
+# What the rule-based English lemmatizer needs; everything else is skipped
+LEMMA_COMPONENTS = ("tok2vec", "tagger", "attribute_ruler", "lemmatizer")
+# Never loaded at all for lemmatization (saves their weights and load time)
+LEMMA_EXCLUDE = ("parser", "ner", "senter")
+DEFAULT_SENTENCE_MODEL = "all-MiniLM-L6-v2"
+# ---------------------------------------
+
+_models = {}
+_lock = threading.Lock()
+
+
+def get_nlp(name=DEFAULT_MODEL, components=LEMMA_COMPONENTS, exclude=LEMMA_EXCLUDE):
+    """Return a process-wide spaCy pipeline, loading it on first use.
+
+    spaCy itself is imported here too, so importing a stage that may need a
+    model costs nothing until the model is actually used.
+    """
+    key = (name, tuple(components), tuple(exclude))
+    with _lock:
+        if key not in _models:
+            import spacy
+            nlp = spacy.load(name, exclude=list(exclude))
+            extra = [p for p in nlp.pipe_names if p not in components]
+            if extra:
+                nlp.select_pipes(disable=extra)
+            _models[key] = nlp
+        return _models[key]
+
+
+def get_sentence_model(name=DEFAULT_SENTENCE_MODEL):
+    """Process-wide sentence-transformers encoder, loaded on first use"""
+    key = ("sentence-transformers", name)
+    with _lock:
+        if key not in _models:
+            from sentence_transformers import SentenceTransformer
+            _models[key] = SentenceTransformer(name)
+        return _models[key]
+
+
+def loaded_models():
+    with _lock:
+        return list(_models)
@@ -0,0 +1,117 @@
+import os
+import json
+import pickle
+import hashlib
+import inspect
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+# ---------------- CONFIG ----------------
+WORKERS = os.cpu_count() or 1
+MANIFEST_NAME = ".render_cache.json"   # output file -> hash of its inputs, per figure directory
+# ---------------------------------------
+
+# draw(inputs, output, **settings) must be a module-level function so workers can
+# unpickle it; settings are render options such as dpi, hashed like the inputs
+FigureTask = namedtuple("FigureTask", ["output", "draw", "inputs", "settings"], defaults=[None])
+
+
+def _feed(h, obj):
+    """Add a stable digest of obj to hash h (DataFrames hashed by content)"""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        if isinstance(obj, pd.DataFrame):
+            meta = (obj.shape, list(obj.columns), [str(t) for t in obj.dtypes])
+        else:
+            meta = (obj.shape, obj.name, str(obj.dtype))
+        h.update(repr((type(obj).__name__,) + meta).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, dict):
+        h.update(b"{")
+        for key in sorted(obj, key=repr):
+            _feed(h, key)
+            _feed(h, obj[key])
+        h.update(b"}")
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"[")
+        for item in obj:
+            _feed(h, item)
+        h.update(b"]")
+    else:
+        h.update(pickle.dumps(obj))
+
+
+def task_hash(task):
+    """Hash of a figure's inputs and settings plus the source of the function
+    drawing it, so editing a figure's code re-renders it too"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(inspect.getsource(task.draw).encode("utf-8"))
+    _feed(h, task.inputs)
+    _feed(h, task.settings or {})
+    return h.hexdigest()
+
+
+def _load_manifest(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(path, manifest):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use("Agg")   # no display needed, and no GUI state shared between figures
+
+
+def _render(task):
+    import matplotlib.pyplot as plt
+    task.draw(task.inputs, task.output, **(task.settings or {}))
+    plt.close("all")
+    return task.output
+
+
+def render_all(tasks, workers=WORKERS, force=False):
+    """Render the tasks whose inputs changed since their last render, in
+    parallel worker processes. Returns (rendered, skipped) output lists.
+    If a figure fails, the others still finish and are cached, then the
+    first failure is raised."""
+    hashes = {task.output: task_hash(task) for task in tasks}
+    manifests = {}
+    todo, skipped = [], []
+    for task in tasks:
+        directory = os.path.dirname(task.output) or "."
+        os.makedirs(directory, exist_ok=True)
+        manifest = manifests.setdefault(directory, _load_manifest(os.path.join(directory, MANIFEST_NAME)))
+        if not force and os.path.exists(task.output) and manifest.get(os.path.basename(task.output)) == hashes[task.output]:
+            skipped.append(task.output)
+        else:
+            todo.append(task)
+
+    rendered, failed = [], []
+    if todo:
+        with ProcessPoolExecutor(max_workers=min(workers, len(todo)), initializer=_init_worker) as pool:
+            futures = {pool.submit(_render, task): task.output for task in todo}
+            # record each figure as soon as it is written, so a failure keeps the others cached
+            for future in as_completed(futures):
+                output = futures[future]
+                try:
+                    future.result()
+                except Exception as exc:
+                    print(f"Failed to render {output}: {exc}")
+                    failed.append(exc)
+                    continue
+                directory = os.path.dirname(output) or "."
+                manifests[directory][os.path.basename(output)] = hashes[output]
+                _save_manifest(os.path.join(directory, MANIFEST_NAME), manifests[directory])
+                rendered.append(output)
+    if failed:
+        raise failed[0]
+    return rendered, skipped
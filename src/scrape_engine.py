@@ -0,0 +1,204 @@
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from datetime import datetime
+
+from tqdm import tqdm
+from google_play_scraper import reviews, Sort
+
+from scrape_state import stream_key, token_to_dict, token_from_dict, as_datetime
+
+# --------- CONFIG ---------
+MAX_WORKERS = 8           # streams scraped at the same time
+PER_HOST_LIMIT = 4        # page requests in flight per host
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0        # seconds, doubled on every retry
+BACKOFF_CAP = 30.0
+PAGE_SIZE = 200
+DEFAULT_HOST = "play.google.com"
+# --------------------------
+
+# One scrape stream = one app in one (lang, country) store listing
+Stream = namedtuple("Stream", ["app_name", "package_id", "lang", "country"])
+
+
+def default_host(stream):
+    """All Play Store streams hit the same host"""
+    return DEFAULT_HOST
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def fetch_page(stream, token, fetch_fn=reviews, semaphore=None,
+               retries=MAX_RETRIES, sleep=time.sleep):
+    """Fetch one page of a stream, retrying failed requests with jittered backoff"""
+    semaphore = semaphore or nullcontext()
+    for attempt in range(retries + 1):
+        try:
+            with semaphore:
+                return fetch_fn(
+                    stream.package_id,
+                    lang=stream.lang,
+                    country=stream.country,
+                    sort=Sort.NEWEST,
+                    count=PAGE_SIZE,
+                    continuation_token=token
+                )
+        except Exception as exc:
+            if attempt == retries:
+                raise
+            delay = backoff_delay(attempt)
+            print(f"  {stream.app_name} [{stream.lang}-{stream.country}] page failed ({exc}), "
+                  f"retry {attempt + 1}/{retries} in {delay:.1f}s")
+            sleep(delay)
+
+
+def fetch_stream(stream, count, fetch_fn=reviews, semaphore=None, on_page=None):
+    """Page through a stream until `count` reviews are collected or it runs dry.
+
+    Returns the reviews as a list, or, when `on_page(stream, batch)` is
+    given, hands each page to it instead of keeping it and returns the
+    number of reviews seen.
+    """
+    all_reviews = []
+    fetched = 0
+    next_token = None
+
+    pbar = tqdm(total=count, desc=f"Fetching {stream.app_name} [{stream.lang}-{stream.country}]")
+
+    while fetched < count:
+        batch, next_token = fetch_page(stream, next_token, fetch_fn, semaphore)
+
+        if not batch:
+            break
+
+        batch = batch[:count - fetched]
+        fetched += len(batch)
+        if on_page is not None:
+            on_page(stream, batch)
+        else:
+            all_reviews.extend(batch)
+        pbar.update(len(batch))
+
+        if next_token is None:
+            break
+
+    pbar.close()
+    return fetched if on_page is not None else all_reviews
+
+
+def take_until_known(batch, known_id=None, known_at=None):
+    """Keep the reviews of a NEWEST-sorted page that come before the first known one"""
+    fresh = []
+    for review in batch:
+        if known_id is not None and review.get("reviewId") == known_id:
+            break
+        if known_at is not None and as_datetime(review.get("at")) < known_at:
+            break
+        fresh.append(review)
+    return fresh
+
+
+def fetch_stream_incremental(stream, count, fetch_fn=reviews, semaphore=None,
+                             state=None, on_page=None):
+    """Page a stream only down to the newest review seen by the last run.
+
+    Every page is handed to `on_page(stream, batch)` (which should persist
+    it) before the continuation token is checkpointed, so a crashed run
+    resumes from its last page. `count` is checked between pages; a run
+    that hits it before reaching the known boundary keeps its checkpoint
+    and the old boundary, and the next run backfills the gap before
+    moving the boundary up (reviews newer than the gap wait until then).
+    Returns the number of new reviews.
+    """
+    key = stream_key(stream)
+    entry = state.get(key)
+    known_id = entry.get("newest_review_id")
+    known_at = as_datetime(entry.get("newest_at"))
+
+    pending = entry.get("pending")
+    if pending:
+        print(f"Resuming {key} from checkpoint")
+        next_token = token_from_dict(pending["token"])
+        run_newest = pending.get("newest")
+    else:
+        next_token = None
+        run_newest = None
+
+    collected = 0
+    reached_boundary = False
+    pbar = tqdm(total=count, desc=f"Updating {stream.app_name} [{stream.lang}-{stream.country}]")
+
+    while collected < count:
+        batch, next_token = fetch_page(stream, next_token, fetch_fn, semaphore)
+        if not batch:
+            reached_boundary = True
+            break
+
+        # whole pages only: the token points past the page, so a cut would lose reviews
+        fresh = take_until_known(batch, known_id, known_at)
+        if fresh and run_newest is None:
+            run_newest = {"review_id": fresh[0].get("reviewId"),
+                          "at": str(as_datetime(fresh[0].get("at")))}
+        if fresh and on_page is not None:
+            on_page(stream, fresh)
+        collected += len(fresh)
+        pbar.update(len(fresh))
+
+        state.update(key, pending={"token": token_to_dict(next_token), "newest": run_newest},
+                     continuation_token=token_to_dict(next_token))
+
+        if len(fresh) < len(batch) or next_token is None:
+            reached_boundary = True
+            break
+
+    pbar.close()
+
+    # a first run has no boundary: its newest `count` reviews are the baseline
+    if not reached_boundary and (known_id is not None or known_at is not None):
+        # stopped at the cap: leave the checkpoint so the next run closes the gap
+        state.update(key, last_run=datetime.now().isoformat(timespec="seconds"))
+        print(f"{key}: stopped at {count} reviews before the last known one, "
+              f"the next run continues from here")
+        return collected
+
+    newest = run_newest or {"review_id": known_id, "at": entry.get("newest_at")}
+    state.update(key, pending=None,
+                 newest_review_id=newest["review_id"],
+                 newest_at=newest["at"],
+                 last_run=datetime.now().isoformat(timespec="seconds"))
+    return collected
+
+
+def run_streams(streams, count, fetch_fn=reviews, max_workers=MAX_WORKERS,
+                per_host_limit=PER_HOST_LIMIT, host_fn=default_host,
+                worker=fetch_stream):
+    """Scrape many streams concurrently.
+
+    `worker(stream, count, fetch_fn, semaphore)` pages one stream; it
+    defaults to `fetch_stream`. Returns {stream: result} for every stream
+    that finished; streams that still fail after all retries are reported
+    and left out.
+    """
+    semaphores = {host_fn(s): threading.BoundedSemaphore(per_host_limit) for s in streams}
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(worker, s, count, fetch_fn, semaphores[host_fn(s)]): s
+            for s in streams
+        }
+        for future in as_completed(futures):
+            stream = futures[future]
+            try:
+                results[stream] = future.result()
+            except Exception as exc:
+                print(f"Failed to scrape {stream.app_name} [{stream.lang}-{stream.country}]: {exc}")
+
+    return results
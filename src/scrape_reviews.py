@@ -1,8 +1,13 @@
 import os
+import threading
 import pandas as pd
-from tqdm import tqdm
-from google_play_scraper import reviews, Sort
+from google_play_scraper import reviews
 from datetime import datetime
+from functools import partial
+
+from scrape_engine import Stream, fetch_stream, fetch_stream_incremental, run_streams
+from scrape_state import ScrapeState
+from clean_reviews import clean_frame, append_cleaned, open_index, write_new_rows
 
 
 # --------- CONFIG ---------
@@ -14,53 +19,100 @@ APPS = {
 
 OUTPUT_DIR = "../data/raw"
 REVIEWS_PER_APP = 400   # You can increase later
+LOCALES = [("en", "us")]  # (lang, country) store listings to scrape per app
+INCREMENTAL = False      # only fetch reviews newer than the last run
+STATE_FILE = f"{OUTPUT_DIR}/scrape_state.json"
+STREAMING = False        # clean each page on arrival and append it to CLEANED_FILE
+CLEANED_FILE = "../data/processed/cleaned_reviews.csv"
+GLOBAL_DEDUP = False     # with STREAMING, skip reviews cleaned by any earlier run
+INDEX_FILE = "../data/processed/review_index.sqlite"
+NEW_REVIEWS_FILE = "../data/processed/new_reviews.csv"
 # --------------------------
 
 
-def fetch_reviews(app_name, package_id, count=REVIEWS_PER_APP):
+def fetch_reviews(app_name, package_id, count=REVIEWS_PER_APP, lang="en", country="us", fetch_fn=reviews):
     print(f"\nScraping {app_name} ({package_id})...")
+    stream = Stream(app_name, package_id, lang, country)
+    return fetch_stream(stream, count, fetch_fn)
 
-    all_reviews = []
-    next_token = None
-
-    pbar = tqdm(total=count, desc=f"Fetching {app_name}")
-
-    while len(all_reviews) < count:
-        batch, next_token = reviews(
-            package_id,
-            lang="en",
-            country="us",
-            sort=Sort.NEWEST,
-            count=200,
-            continuation_token=next_token
-        )
-
-        if not batch:
-            break
 
-        all_reviews.extend(batch)
-        pbar.update(len(batch))
+def output_path(app_name, lang="en", country="us"):
+    locale = "" if (lang, country) == ("en", "us") else f"_{lang}_{country}"
+    return f"{OUTPUT_DIR}/{app_name.lower()}{locale}_{datetime.now().date()}.csv"
 
-        if next_token is None:
-            break
 
-    pbar.close()
-    return all_reviews[:count]
-
-
-def save_reviews(app_name, data):
+def save_reviews(app_name, data, lang="en", country="us"):
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
     df = pd.DataFrame(data)
-    filename = f"{OUTPUT_DIR}/{app_name.lower()}_{datetime.now().date()}.csv"
+    filename = output_path(app_name, lang, country)
     df.to_csv(filename, index=False)
     print(f"Saved {len(df)} reviews → {filename}")
 
 
-def main():
-    for app_name, package_id in APPS.items():
-        data = fetch_reviews(app_name, package_id)
-        save_reviews(app_name, data)
+def append_reviews(stream, batch):
+    """Append one page to today's raw file so every checkpoint is backed by data on disk"""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    filename = output_path(stream.app_name, stream.lang, stream.country)
+    pd.DataFrame(batch).to_csv(filename, mode="a", index=False,
+                               header=not os.path.exists(filename))
+
+
+_stream_lock = threading.Lock()
+_seen_ids = set()
+_index = None
+
+
+def stream_cleaned(stream, batch):
+    """Clean one page, drop reviews already written, and append it"""
+    df = clean_frame(pd.DataFrame(batch), stream.app_name)
+    with _stream_lock:
+        if _index is not None:
+            write_new_rows(df, CLEANED_FILE, _index, NEW_REVIEWS_FILE)
+            return
+        df = df[~df["review_id"].isin(_seen_ids)]
+        _seen_ids.update(df["review_id"])
+        append_cleaned(df, CLEANED_FILE)
+
+
+def main(fetch_fn=reviews):
+    global _index
+    streams = [
+        Stream(app_name, package_id, lang, country)
+        for app_name, package_id in APPS.items()
+        for lang, country in LOCALES
+    ]
+    if STREAMING and GLOBAL_DEDUP:
+        # incremental runs only fetch new reviews, so they must keep the earlier output
+        _index = open_index(CLEANED_FILE, NEW_REVIEWS_FILE, INDEX_FILE, rebuild=not INCREMENTAL)
+
+    if INCREMENTAL:
+        # new reviews (and pages of a resumed run) are appended to earlier output
+        state = ScrapeState(STATE_FILE)
+        on_page = stream_cleaned if STREAMING else append_reviews
+        worker = partial(fetch_stream_incremental, state=state, on_page=on_page)
+        print(f"Updating {len(streams)} streams concurrently...")
+        results = run_streams(streams, REVIEWS_PER_APP, fetch_fn, worker=worker)
+        for stream, new_count in results.items():
+            print(f"{stream.app_name} [{stream.lang}-{stream.country}]: {new_count} new reviews")
+        return
+
+    if STREAMING:
+        # a full re-scrape replaces the cleaned file, unless the dedup index owns it
+        if _index is None and os.path.exists(CLEANED_FILE):
+            os.remove(CLEANED_FILE)
+        worker = partial(fetch_stream, on_page=stream_cleaned)
+        print(f"Streaming {len(streams)} streams concurrently → {CLEANED_FILE}")
+        results = run_streams(streams, REVIEWS_PER_APP, fetch_fn, worker=worker)
+        for stream, fetched in results.items():
+            print(f"{stream.app_name} [{stream.lang}-{stream.country}]: {fetched} reviews cleaned")
+        return
+
+    print(f"Scraping {len(streams)} streams concurrently...")
+    results = run_streams(streams, REVIEWS_PER_APP, fetch_fn)
+
+    for stream, data in results.items():
+        save_reviews(stream.app_name, data, stream.lang, stream.country)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,67 @@
+import json
+import os
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+
+# Attributes of google_play_scraper's continuation token, enough to rebuild it
+TOKEN_FIELDS = ("token", "lang", "country", "sort", "count",
+                "filter_score_with", "filter_device_with")
+
+
+def stream_key(stream):
+    return f"{stream.app_name}:{stream.lang}:{stream.country}"
+
+
+def token_to_dict(token):
+    if token is None:
+        return None
+    return {field: getattr(token, field, None) for field in TOKEN_FIELDS}
+
+
+def token_from_dict(data):
+    """Rebuild a continuation token; `reviews()` only reads its attributes"""
+    if not data:
+        return None
+    return SimpleNamespace(**data)
+
+
+def as_datetime(value):
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+class ScrapeState:
+    """Small JSON checkpoint store shared by all scrape threads.
+
+    Per stream it keeps the newest review seen (`newest_review_id`,
+    `newest_at`), the last continuation token, and a `pending` checkpoint
+    for a run that has not finished yet.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._data = json.load(f)
+
+    def get(self, key):
+        with self._lock:
+            return dict(self._data.get(key, {}))
+
+    def update(self, key, **fields):
+        with self._lock:
+            entry = self._data.setdefault(key, {})
+            entry.update(fields)
+            self._flush()
+
+    def _flush(self):
+        # Write to a temp file first so a crash never leaves a half-written state
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, indent=2, default=str)
+        os.replace(tmp_path, self.path)
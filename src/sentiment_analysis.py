@@ -1,13 +1,47 @@
 import os
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from importlib.metadata import version, PackageNotFoundError
+from itertools import chain
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
+from storage import read_dataset, write_dataset, dataset_exists
+from sentiment_cache import SentimentCache
+
 # ---------------- CONFIG ----------------
 PROCESSED_DIR = "data/processed"
-INPUT_FILE = f"{PROCESSED_DIR}/cleaned_reviews.csv"
-OUTPUT_FILE = f"{PROCESSED_DIR}/processed_reviews_sentiment.csv"
+INPUT_DATASET = f"{PROCESSED_DIR}/cleaned_reviews"
+OUTPUT_DATASET = f"{PROCESSED_DIR}/processed_reviews_sentiment"
+WORKERS = os.cpu_count() or 1   # processes, each with its own analyzer
+BATCH_SIZE = 5000               # reviews per task
+USE_CACHE = True                # reuse scores of texts seen in earlier runs
+CACHE_FILE = f"{PROCESSED_DIR}/sentiment_cache.sqlite"
+CACHE_MAX_ENTRIES = 2_000_000
+# "vader", "transformer" (local CPU classifier for every review) or
+# "hybrid" (transformer only for reviews VADER puts in the neutral band)
+BACKEND = "vader"
+AMBIGUOUS_BAND = 0.05
+# Score only the rows the last GLOBAL_DEDUP cleaning run added and merge them
+# into OUTPUT_DATASET; the scored rows alone also go to NEW_OUTPUT_DATASET
+NEW_ONLY = False
+NEW_INPUT_DATASET = f"{PROCESSED_DIR}/new_reviews"
+NEW_OUTPUT_DATASET = f"{PROCESSED_DIR}/new_reviews_sentiment"
 # ---------------------------------------
 
+def analyzer_version(backend=BACKEND):
+    """Cache key prefix: changes whenever the scores could change"""
+    try:
+        vader = f"vader-{version('vaderSentiment')}"
+    except PackageNotFoundError:
+        vader = "vader"
+    if backend == "vader":
+        return vader
+    from transformer_sentiment import MODEL_NAME
+    if backend == "transformer":
+        return f"transformer-{MODEL_NAME}"
+    return f"hybrid-{AMBIGUOUS_BAND}-{vader}-{MODEL_NAME}"
+
 def analyze_sentiment(text, analyzer):
     """Compute sentiment label and score using VADER"""
     if not isinstance(text, str) or text.strip() == "":
@@ -22,20 +56,123 @@ def analyze_sentiment(text, analyzer):
         label = "neutral"
     return label, compound
 
+def labels_from_scores(scores):
+    """Vectorized version of the thresholds in analyze_sentiment"""
+    return np.select([scores >= 0.05, scores <= -0.05], ["positive", "negative"], default="neutral")
+
+_analyzer = None
+
+def _init_worker():
+    global _analyzer
+    _analyzer = SentimentIntensityAnalyzer()
+
+def _score_batch(texts):
+    """Compound scores for one batch, with this process's analyzer"""
+    if _analyzer is None:
+        _init_worker()
+    return [analyze_sentiment(text, _analyzer)[1] for text in texts]
+
+_transformer = None
+
+def transformer_scores(texts):
+    """Compound scores from the transformer backend (model loaded once per process)"""
+    global _transformer
+    if _transformer is None:
+        from transformer_sentiment import TransformerAnalyzer
+        _transformer = TransformerAnalyzer()
+    return _transformer.score_texts(list(texts))
+
+def score_reviews(texts, workers=WORKERS, batch_size=BATCH_SIZE, backend=BACKEND):
+    """Score a whole column and return (labels, scores) as numpy arrays
+    aligned with `texts`. VADER runs in batches across a process pool."""
+    texts = list(texts)
+    if backend == "transformer":
+        scores = transformer_scores(texts)
+        return labels_from_scores(scores), scores
+
+    scores = vader_scores(texts, workers, batch_size)
+    if backend == "hybrid":
+        ambiguous = np.flatnonzero(np.abs(scores) < AMBIGUOUS_BAND)
+        if len(ambiguous):
+            print(f"Re-scoring {len(ambiguous)} ambiguous reviews with the transformer")
+            scores[ambiguous] = transformer_scores([texts[i] for i in ambiguous])
+    return labels_from_scores(scores), scores
+
+def vader_scores(texts, workers=WORKERS, batch_size=BATCH_SIZE):
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+
+    if workers <= 1 or len(batches) <= 1:
+        results = map(_score_batch, batches)
+        scores = np.fromiter(chain.from_iterable(results), dtype=float, count=len(texts))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            results = pool.map(_score_batch, batches)
+            scores = np.fromiter(chain.from_iterable(results), dtype=float, count=len(texts))
+    return scores
+
+def score_reviews_cached(texts, cache):
+    """score_reviews, but each distinct text is scored at most once and only
+    if the cache does not already hold it"""
+    texts = pd.Series(texts, dtype=object)
+    texts = texts.where(texts.map(lambda t: isinstance(t, str)), "")
+    uniques = pd.unique(texts)
+
+    cached = cache.get_many(uniques)
+    missing = [t for t in uniques if t not in cached]
+    if missing:
+        labels, scores = score_reviews(missing)
+        cache.put_many(zip(missing, labels, scores))
+        cached.update(zip(missing, zip(labels, scores)))
+    print(f"Sentiment cache: {len(uniques) - len(missing)} of {len(uniques)} distinct texts reused")
+
+    unique_labels = np.array([cached[t][0] for t in uniques], dtype=object)
+    unique_scores = np.array([cached[t][1] for t in uniques], dtype=float)
+    idx = pd.Index(uniques).get_indexer(texts)
+    return unique_labels[idx], unique_scores[idx]
+
+def add_sentiment(df):
+    """df with sentiment_label / sentiment_score columns for its reviews"""
+    if USE_CACHE:
+        cache = SentimentCache(CACHE_FILE, analyzer_version(), CACHE_MAX_ENTRIES)
+        labels, scores = score_reviews_cached(df['review'], cache)
+        cache.close()
+    else:
+        labels, scores = score_reviews(df['review'])
+    df['sentiment_label'] = labels
+    df['sentiment_score'] = scores
+    return df
+
+def score_new_reviews():
+    """Score NEW_INPUT_DATASET and merge it into OUTPUT_DATASET, replacing
+    any earlier rows with the same review_id"""
+    new = add_sentiment(read_dataset(NEW_INPUT_DATASET))
+    write_dataset(new, NEW_OUTPUT_DATASET)
+    old = read_dataset(OUTPUT_DATASET)
+    df = pd.concat([old[~old['review_id'].isin(new['review_id'])], new], ignore_index=True)
+    write_dataset(df, OUTPUT_DATASET)
+    print(f"Scored {len(new)} new reviews → {NEW_OUTPUT_DATASET}")
+    print(f"Saved {len(df)} sentiment-analyzed reviews → {OUTPUT_DATASET}")
+
 def main():
     os.makedirs(PROCESSED_DIR, exist_ok=True)
+
+    if NEW_ONLY:
+        if not dataset_exists(NEW_INPUT_DATASET):
+            print(f"No {NEW_INPUT_DATASET} dataset; run clean_reviews.py with GLOBAL_DEDUP first")
+            return
+        if dataset_exists(OUTPUT_DATASET):
+            score_new_reviews()
+            return
+        print(f"No {OUTPUT_DATASET} yet, scoring every cleaned review")
     
-    df = pd.read_csv(INPUT_FILE)
-    analyzer = SentimentIntensityAnalyzer()
+    df = read_dataset(INPUT_DATASET)
     
     # Apply sentiment analysis
-    sentiments = df['review'].apply(lambda x: analyze_sentiment(x, analyzer))
-    df['sentiment_label'] = sentiments.apply(lambda x: x[0])
-    df['sentiment_score'] = sentiments.apply(lambda x: x[1])
+    df = add_sentiment(df)
     
-    # Save to new CSV
-    df.to_csv(OUTPUT_FILE, index=False)
-    print(f"Saved sentiment-analyzed reviews → {OUTPUT_FILE}")
+    # Save dataset (CSV and/or Parquet)
+    write_dataset(df, OUTPUT_DATASET)
+    print(f"Saved sentiment-analyzed reviews → {OUTPUT_DATASET}")
     print(df.head())
 
 if __name__ == "__main__":
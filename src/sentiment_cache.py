@@ -0,0 +1,83 @@
+import os
+import time
+import sqlite3
+
+from dedup_index import id_hash
+
+QUERY_BATCH = 500   # keys per IN (...) lookup, below SQLite's parameter limit
+
+
+class SentimentCache:
+    """On-disk (label, compound) cache keyed by a hash of analyzer version + text.
+
+    Holds at most `max_entries` rows; the least recently used ones are
+    evicted when a run adds more. Bumping the analyzer version invalidates
+    every entry without touching the file.
+    """
+
+    def __init__(self, path, version, max_entries):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.version = version
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS sentiment (
+                key INTEGER PRIMARY KEY,
+                label TEXT,
+                compound REAL,
+                last_used INTEGER
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS sentiment_last_used ON sentiment(last_used)")
+        self.conn.commit()
+
+    def key(self, text):
+        return id_hash(f"{self.version}\x00{text}")
+
+    def get_many(self, texts):
+        """Return {text: (label, compound)} for the texts that are cached"""
+        keys = {self.key(t): t for t in texts}
+        found = {}
+        key_list = list(keys)
+        now = int(time.time())
+        with self.conn:
+            for i in range(0, len(key_list), QUERY_BATCH):
+                part = key_list[i:i + QUERY_BATCH]
+                placeholders = ",".join("?" * len(part))
+                rows = self.conn.execute(
+                    f"SELECT key, label, compound FROM sentiment WHERE key IN ({placeholders})", part
+                ).fetchall()
+                for key, label, compound in rows:
+                    found[keys[key]] = (label, compound)
+                self.conn.execute(
+                    f"UPDATE sentiment SET last_used = ? WHERE key IN ({placeholders})", [now] + part
+                )
+        return found
+
+    def put_many(self, rows):
+        """Store (text, label, compound) rows, then evict down to max_entries"""
+        now = int(time.time())
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO sentiment VALUES (?, ?, ?, ?)",
+                ((self.key(t), label, float(compound), now) for t, label, compound in rows)
+            )
+        self.evict()
+
+    def evict(self):
+        count = len(self)
+        if count <= self.max_entries:
+            return
+        with self.conn:
+            self.conn.execute("""
+                DELETE FROM sentiment WHERE key IN (
+                    SELECT key FROM sentiment ORDER BY last_used LIMIT ?
+                )
+            """, (count - self.max_entries,))
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM sentiment").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
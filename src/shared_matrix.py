@@ -0,0 +1,31 @@
+import os
+import numpy as np
+from scipy import sparse
+
+# A CSR matrix is stored as three .npy buffers so worker processes can
+# memory-map them instead of each receiving a pickled copy.
+PARTS = ("data", "indices", "indptr")
+
+
+def save_csr(X, directory):
+    os.makedirs(directory, exist_ok=True)
+    X = sparse.csr_matrix(X)
+    for part in PARTS:
+        np.save(os.path.join(directory, f"{part}.npy"), getattr(X, part))
+    np.save(os.path.join(directory, "shape.npy"), np.array(X.shape))
+
+
+def load_csr(directory):
+    """Memory-mapped CSR view; only rows that get sliced out are read"""
+    arrays = [np.load(os.path.join(directory, f"{part}.npy"), mmap_mode="r") for part in PARTS]
+    shape = tuple(np.load(os.path.join(directory, "shape.npy")))
+    return sparse.csr_matrix(tuple(arrays), shape=shape, copy=False)
+
+
+def save_array(values, path):
+    """Fixed-width (non-object) array, so it can be memory-mapped too"""
+    np.save(path, np.asarray(values).astype(str))
+
+
+def load_array(path):
+    return np.load(path, mmap_mode="r")
@@ -0,0 +1,150 @@
+import os
+import shutil
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# ---------------- CONFIG ----------------
+STORAGE_FORMAT = os.environ.get("REVIEWS_STORAGE_FORMAT", "csv")   # "csv", "parquet" or "both"
+PARTITION_COLS = ["bank", "month"]    # month = YYYY-MM of the review date
+CATEGORY_COLUMNS = ["bank", "sentiment_label"]
+# ---------------------------------------
+
+# A dataset is addressed by its path without extension, e.g.
+# "data/processed/cleaned_reviews" → cleaned_reviews.csv and/or
+# cleaned_reviews.parquet/bank=CBE/month=2025-01/*.parquet
+
+
+def apply_types(df):
+    """Compact column types: category bank/label, int8 rating, date32 date"""
+    df = df.copy()
+    for col in CATEGORY_COLUMNS:
+        if col in df:
+            df[col] = df[col].astype("category")
+    if "rating" in df and df["rating"].notna().all():
+        df["rating"] = df["rating"].astype("int8")
+    if "date" in df:
+        df["date"] = pd.to_datetime(df["date"]).dt.date
+    return df
+
+
+def write_dataset(df, path, fmt=None):
+    """Replace the dataset at `path` with df in the configured format(s)"""
+    fmt = fmt or STORAGE_FORMAT
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    if fmt in ("csv", "both"):
+        df.to_csv(f"{path}.csv", index=False)
+
+    if fmt in ("parquet", "both"):
+        if not HAS_PYARROW:
+            raise ImportError("Parquet storage needs pyarrow: pip install pyarrow")
+        typed = apply_types(df)
+        if "month" in PARTITION_COLS and "date" in typed:
+            typed["month"] = pd.to_datetime(typed["date"]).dt.strftime("%Y-%m")
+        partition_cols = [c for c in PARTITION_COLS if c in typed]
+        table = pa.Table.from_pandas(typed, preserve_index=False)
+
+        root = f"{path}.parquet"
+        if os.path.isdir(root):
+            shutil.rmtree(root)
+        ds.write_dataset(table, root, format="parquet",
+                         partitioning=partition_cols, partitioning_flavor="hive")
+
+
+def parquet_is_current(path):
+    """True if the Parquet copy exists and is not older than the CSV one
+    (append-only modes such as streaming cleaning only extend the CSV)"""
+    root, csv_file = f"{path}.parquet", f"{path}.csv"
+    if not os.path.isdir(root):
+        return False
+    return not os.path.exists(csv_file) or os.path.getmtime(root) >= os.path.getmtime(csv_file)
+
+
+def dataset_exists(path):
+    return os.path.exists(f"{path}.csv") or os.path.isdir(f"{path}.parquet")
+
+
+def export_csv(path):
+    """Write a CSV copy of a Parquet dataset"""
+    read_dataset(path, fmt="parquet").to_csv(f"{path}.csv", index=False)
+
+
+def read_dataset(path, columns=None, banks=None, start=None, end=None, fmt=None):
+    """Load a dataset, optionally only some columns, banks and a date range.
+
+    Parquet is used when configured and present, so only the requested
+    columns and the bank/month partitions that can match are read;
+    otherwise the CSV is read and filtered in pandas.
+    """
+    fmt = fmt or STORAGE_FORMAT
+    root = f"{path}.parquet"
+    if fmt in ("parquet", "both") and HAS_PYARROW and parquet_is_current(path):
+        return _read_parquet(root, columns, banks, start, end)
+
+    filter_cols = [c for c, v in (("bank", banks), ("date", start or end)) if v]
+    usecols = None if columns is None else list(dict.fromkeys(columns + filter_cols))
+    df = pd.read_csv(f"{path}.csv", usecols=usecols)
+    if banks:
+        df = df[df["bank"].isin(banks)]
+    if start:
+        df = df[pd.to_datetime(df["date"]) >= pd.Timestamp(start)]
+    if end:
+        df = df[pd.to_datetime(df["date"]) <= pd.Timestamp(end)]
+    return df[columns].reset_index(drop=True) if columns else df.reset_index(drop=True)
+
+
+def _read_parquet(root, columns, banks, start, end):
+    dataset = ds.dataset(root, format="parquet",
+                         partitioning=ds.HivePartitioning.discover(infer_dictionary=True))
+    names = dataset.schema.names
+
+    filters = []
+    if banks and "bank" in names:
+        filters.append(ds.field("bank").isin(list(banks)))
+    if start:
+        start = pd.Timestamp(start)
+        if "month" in names:
+            filters.append(ds.field("month") >= start.strftime("%Y-%m"))
+        filters.append(ds.field("date") >= pa.scalar(start.date(), pa.date32()))
+    if end:
+        end = pd.Timestamp(end)
+        if "month" in names:
+            filters.append(ds.field("month") <= end.strftime("%Y-%m"))
+        filters.append(ds.field("date") <= pa.scalar(end.date(), pa.date32()))
+
+    expr = None
+    for f in filters:
+        expr = f if expr is None else expr & f
+
+    if columns is None:
+        columns = [c for c in names if c != "month"]
+    df = dataset.to_table(columns=columns, filter=expr).to_pandas()
+
+    # partition values come back as categories holding every partition
+    for col in df.select_dtypes("category"):
+        df[col] = df[col].cat.remove_unused_categories()
+    return df
+
+
+def iter_dataset(path, columns=None, chunk_rows=50_000, fmt=None):
+    """Yield a dataset as DataFrames of at most chunk_rows rows, so stages
+    can stream data that does not fit in memory"""
+    fmt = fmt or STORAGE_FORMAT
+    root = f"{path}.parquet"
+    if fmt in ("parquet", "both") and HAS_PYARROW and parquet_is_current(path):
+        dataset = ds.dataset(root, format="parquet",
+                             partitioning=ds.HivePartitioning.discover(infer_dictionary=True))
+        if columns is None:
+            columns = [c for c in dataset.schema.names if c != "month"]
+        for batch in dataset.to_batches(columns=columns, batch_size=chunk_rows):
+            if batch.num_rows:
+                yield batch.to_pandas()
+        return
+
+    yield from pd.read_csv(f"{path}.csv", usecols=columns, chunksize=chunk_rows)
@@ -0,0 +1,53 @@
+import re
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+
+WORD_PATTERN = re.compile(r"\b[a-z]{3,}\b")
+PUNCT_PATTERN = re.compile(r"[^\w\s]")
+
+
+def word_tokens(text, stopwords):
+    """Lowercase words of 3+ ascii letters, stopwords removed (Analysis' keyword rule)"""
+    return [w for w in WORD_PATTERN.findall(text.lower()) if w not in stopwords]
+
+
+def phrase_tokens(text, stopwords):
+    """Punctuation stripped, whitespace split, stopwords and words under 3 chars
+    removed (Insights' phrase rule)"""
+    words = PUNCT_PATTERN.sub("", text.lower()).split()
+    return [w for w in words if w not in stopwords and len(w) > 2]
+
+
+def ngrams(tokens, ngram_range=(1, 1)):
+    lo, hi = ngram_range
+    return [" ".join(tokens[i:i + n]) for n in range(lo, hi + 1) for i in range(len(tokens) - n + 1)]
+
+
+class TermMatrix:
+    """Reviews tokenized once into a sparse document-term count matrix.
+
+    Top terms for any slice of the reviews (bank, rating, sentiment, ...)
+    are column sums over the rows selected by a boolean mask, so no slice
+    is re-joined or re-tokenized.
+    """
+
+    def __init__(self, texts, tokenize, ngram_range=(1, 1)):
+        self.vectorizer = CountVectorizer(analyzer=lambda doc: ngrams(tokenize(doc), ngram_range))
+        self.X = self.vectorizer.fit_transform([str(t) for t in texts]).tocsr()
+        self.terms = self.vectorizer.get_feature_names_out()
+        self.n_words = np.array([t.count(" ") + 1 for t in self.terms])
+
+    def counts(self, mask=None):
+        """Term counts over the rows where mask is True (all rows if None)"""
+        if mask is None:
+            return np.asarray(self.X.sum(axis=0)).ravel()
+        return self.X.T @ np.asarray(mask, dtype=self.X.dtype)
+
+    def top_terms(self, mask=None, top_n=10, n_words=None):
+        """[(term, count), ...] most frequent first, optionally only n-word terms;
+        ties are broken alphabetically"""
+        counts = self.counts(mask)
+        if n_words is not None:
+            counts = np.where(self.n_words == n_words, counts, 0)
+        top = np.argsort(-counts, kind="stable")[:top_n]
+        return [(self.terms[i], int(counts[i])) for i in top if counts[i] > 0]
@@ -1,31 +1,80 @@
 import os
 import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer, HashingVectorizer
 from sklearn.decomposition import LatentDirichletAllocation
-import spacy
+from sklearn.cluster import MiniBatchKMeans
 import json
 import sys
 import glob
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from storage import read_dataset, write_dataset, dataset_exists, iter_dataset
+from lemma_cache import LemmaCache
+from nlp_models import get_nlp, get_sentence_model, DEFAULT_SENTENCE_MODEL
+from embedding_store import EmbeddingStore
+import lda_state
+import shared_matrix
+from hash_terms import HashTermLookup
 
 # CONFIG
-INPUT = "data/processed/processed_reviews_sentiment.csv" 
+INPUT = "data/processed/processed_reviews_sentiment"   # dataset path, .csv or .parquet
 OUT_DIR = "../data/processed/topics"
 N_TOPICS = 5         # change to 3-5 per bank as needed
 TOP_N_WORDS = 12
+N_PROCESS = max(1, (os.cpu_count() or 1) - 1)   # spaCy worker processes
+PIPE_BATCH_SIZE = 1000
+USE_LEMMA_CACHE = True     # only lemmatize reviews not seen before
+LEMMA_CACHE_FILE = os.path.join(OUT_DIR, "lemma_cache.sqlite")
+INCREMENTAL_LDA = False    # update saved per-bank models with new reviews only
+MODEL_DIR = os.path.join(OUT_DIR, "models")
+ONLINE_BATCH_SIZE = 256    # new reviews per partial_fit call
+DRIFT_PERPLEXITY_RATIO = 1.5   # refit when new reviews are this much more "surprising"
+DRIFT_OOV_RATE = 0.25          # ...or when this share of their words is out of vocabulary
+PARALLEL_BANKS = False     # one shared document-term matrix, banks fitted in parallel
+BANK_WORKERS = os.cpu_count() or 1
+MIN_DF, MAX_DF, MAX_FEATURES = 5, 0.95, 5000   # CountVectorizer limits, applied per bank
+STREAMING_TOPICS = False   # out-of-core: hashed features, input read in chunks
+CHUNK_ROWS = 50_000        # reviews held in memory at a time when streaming
+HASH_FEATURES = 2 ** 18    # hashed columns (no vocabulary is kept)
+TERM_LOOKUP = True         # remember frequent terms so hashed topics stay readable
+EMBEDDING_TOPICS = False   # cluster sentence embeddings instead of fitting LDA
+EMBEDDING_MODEL = DEFAULT_SENTENCE_MODEL
+EMBEDDING_DIR = os.path.join(OUT_DIR, "embeddings")   # float16 vectors, reused across runs
+ENCODE_BATCH_SIZE = 256    # reviews per encoder call (each call is appended to the store)
+KMEANS_BATCH_SIZE = 1024
+KMEANS_PASSES = 5          # passes over a bank's vectors with partial_fit
 
-nlp = spacy.load("en_core_web_sm", disable=["parser","ner"])
-
-def preprocess_texts(texts):
+def preprocess_texts(texts, n_process=1, batch_size=50):
     docs = []
-    for doc in nlp.pipe(texts, batch_size=50):
+    # worker processes only pay off once every worker gets a few batches
+    if len(texts) < n_process * batch_size * 2:
+        n_process = 1
+    nlp = get_nlp()   # loaded on first use, not at import
+    for doc in nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
         toks = [t.lemma_.lower() for t in doc if (t.is_alpha and not t.is_stop and len(t)>2)]
         docs.append(" ".join(toks))
     return docs
 
-def topic_model_for_bank(df_bank, bank_name, n_topics=N_TOPICS):
-    texts = df_bank["review"].astype(str).tolist()
-    pre = preprocess_texts(texts)
+def preprocess_reviews(df, lemma_cache=None, n_process=N_PROCESS, batch_size=PIPE_BATCH_SIZE):
+    """Lemmatized token strings for df["review"], reusing cached ones by review_id"""
+    texts = df["review"].fillna("").astype(str).tolist()
+    if lemma_cache is None:
+        return preprocess_texts(texts, n_process, batch_size)
+
+    ids = df["review_id"].astype(str).tolist()
+    cached = lemma_cache.get_many(ids, texts)
+    missing = [i for i, r in enumerate(ids) if r not in cached]
+    if missing:
+        new_tokens = preprocess_texts([texts[i] for i in missing], n_process, batch_size)
+        lemma_cache.put_many([ids[i] for i in missing], [texts[i] for i in missing], new_tokens)
+        cached.update(zip((ids[i] for i in missing), new_tokens))
+    print(f"  lemmatized {len(missing)} new reviews, {len(ids) - len(missing)} from cache")
+    return [cached[r] for r in ids]
+
+def topic_model_for_bank(df_bank, bank_name, n_topics=N_TOPICS, lemma_cache=None):
+    pre = preprocess_reviews(df_bank, lemma_cache)
     # Use CountVectorizer for LDA
     cv = CountVectorizer(max_df=0.95, min_df=5, max_features=5000, ngram_range=(1,2))
     X = cv.fit_transform(pre)
@@ -33,30 +82,302 @@ def topic_model_for_bank(df_bank, bank_name, n_topics=N_TOPICS):
         return None
     lda = LatentDirichletAllocation(n_components=n_topics, random_state=42, learning_method="batch", max_iter=15)
     lda.fit(X)
-    features = cv.get_feature_names_out()
+    topics = topics_from_model(lda, cv.get_feature_names_out())
+    # Assign dominant topic to each doc
+    doc_topics = lda.transform(X).argmax(axis=1)
+    df_bank = df_bank.reset_index(drop=True)
+    df_bank["topic_id"] = doc_topics
+    return topics, df_bank
+
+def topics_from_model(lda, features):
+    return topics_from_weights(lda.components_, features)
+
+def topics_from_weights(weights, features):
     topics = []
-    for topic_idx, topic in enumerate(lda.components_):
+    for topic_idx, topic in enumerate(weights):
         top_indices = topic.argsort()[-TOP_N_WORDS:][::-1]
         top_terms = [features[i] for i in top_indices]
         topics.append({"topic_id": topic_idx, "terms": top_terms})
-    # Assign dominant topic to each doc
-    doc_topics = lda.transform(X).argmax(axis=1)
+    return topics
+
+def fit_online_model(pre, n_topics):
+    """Fresh vocabulary + online LDA over all docs; None if there is nothing to model"""
+    cv = CountVectorizer(max_df=0.95, min_df=5, max_features=5000, ngram_range=(1,2))
+    X = cv.fit_transform(pre)
+    if X.shape[0] == 0 or X.shape[1] == 0:
+        return None
+    lda = LatentDirichletAllocation(n_components=n_topics, random_state=42, learning_method="online",
+                                    batch_size=ONLINE_BATCH_SIZE, total_samples=X.shape[0], max_iter=15)
+    lda.fit(X)
+    return {"vectorizer": cv, "lda": lda, "baseline_perplexity": lda.perplexity(X)}
+
+def incremental_topic_model_for_bank(df_bank, bank_name, n_topics=N_TOPICS, lemma_cache=None):
+    """Like topic_model_for_bank, but folds only unseen reviews into the saved
+    model with partial_fit. A full refit happens on first run or on drift,
+    and refit topics are matched to the old ones so topic ids stay stable."""
+    pre = preprocess_reviews(df_bank, lemma_cache)
+    hashes = lda_state.hash_ids(df_bank["review_id"].astype(str))
+    state = lda_state.load_state(MODEL_DIR, bank_name)
+
+    refit = state is None or state["lda"].n_components != n_topics
+    if not refit:
+        cv, lda = state["vectorizer"], state["lda"]
+        new_idx = np.flatnonzero(~np.isin(hashes, state["seen"]))
+        new_docs = [pre[i] for i in new_idx]
+        if new_docs:
+            X_new = cv.transform(new_docs)
+            ratio = lda.perplexity(X_new) / state["baseline_perplexity"]
+            oov = lda_state.oov_rate(new_docs, cv.vocabulary_)
+            print(f"  {len(new_docs)} new reviews: perplexity ratio {ratio:.2f}, OOV rate {oov:.2f}")
+            if ratio > DRIFT_PERPLEXITY_RATIO or oov > DRIFT_OOV_RATE:
+                print("  drift past threshold, refitting")
+                refit = True
+            else:
+                lda.total_samples = len(state["seen"]) + len(new_docs)
+                for start in range(0, X_new.shape[0], ONLINE_BATCH_SIZE):
+                    lda.partial_fit(X_new[start:start + ONLINE_BATCH_SIZE])
+                state["seen"] = np.union1d(state["seen"], hashes[new_idx])
+
+    if refit:
+        old = state
+        state = fit_online_model(pre, n_topics)
+        if state is None:
+            return None
+        if old is not None and old["lda"].n_components == n_topics:
+            lda_state.align_topics(old["lda"], old["vectorizer"].get_feature_names_out(),
+                                   state["lda"], state["vectorizer"].get_feature_names_out())
+        state["seen"] = np.unique(hashes)
+
+    lda_state.save_state(MODEL_DIR, bank_name, state)
+
+    cv, lda = state["vectorizer"], state["lda"]
+    topics = topics_from_model(lda, cv.get_feature_names_out())
+    doc_topics = lda.transform(cv.transform(pre)).argmax(axis=1)
     df_bank = df_bank.reset_index(drop=True)
     df_bank["topic_id"] = doc_topics
     return topics, df_bank
 
+def embed_reviews(df, store, model_name=EMBEDDING_MODEL, batch_size=ENCODE_BATCH_SIZE):
+    """Store rows of each review's embedding, encoding only reviews the store lacks"""
+    ids = df["review_id"].astype(str).tolist()
+    texts = df["review"].fillna("").astype(str).tolist()
+    rows = store.lookup(ids, texts)
+    missing = np.flatnonzero(rows < 0)
+    if len(missing):
+        model = get_sentence_model(model_name)
+        for start in range(0, len(missing), batch_size):
+            part = missing[start:start + batch_size]
+            vectors = model.encode([texts[i] for i in part], batch_size=batch_size,
+                                   normalize_embeddings=True, show_progress_bar=False)
+            store.append([ids[i] for i in part], [texts[i] for i in part], vectors)
+        rows = store.lookup(ids, texts)
+    print(f"  embedded {len(missing)} new reviews, {len(ids) - len(missing)} from store")
+    return rows
+
+def cluster_terms(pre, labels, n_topics):
+    """Class-based TF-IDF: terms frequent in a cluster but not everywhere"""
+    cv = CountVectorizer(max_df=0.95, min_df=5, max_features=5000, ngram_range=(1,2))
+    X = cv.fit_transform(pre)
+    counts = np.vstack([np.asarray(X[labels == k].sum(axis=0)).ravel() for k in range(n_topics)])
+    tf = counts / np.maximum(counts.sum(axis=1, keepdims=True), 1)
+    idf = np.log(1 + counts.sum() / n_topics / np.maximum(counts.sum(axis=0), 1))
+    return topics_from_weights(tf * idf, cv.get_feature_names_out())
+
+def embedding_topic_model_for_bank(df_bank, bank_name, n_topics=N_TOPICS, lemma_cache=None):
+    """Drop-in alternative to topic_model_for_bank: MiniBatchKMeans over cached
+    sentence embeddings, with topic terms taken from each cluster's lemmas"""
+    if len(df_bank) < n_topics:
+        return None
+    df_bank = df_bank.reset_index(drop=True)
+    store = EmbeddingStore(EMBEDDING_DIR, EMBEDDING_MODEL)
+    rows = embed_reviews(df_bank, store)
+    vectors = store.vectors()
+
+    km = MiniBatchKMeans(n_clusters=n_topics, random_state=42, batch_size=KMEANS_BATCH_SIZE, n_init=3)
+    rng = np.random.default_rng(42)
+    batch = max(KMEANS_BATCH_SIZE, n_topics)
+    for _ in range(KMEANS_PASSES):
+        order = rng.permutation(len(rows))
+        for start in range(0, len(order), batch):
+            part = order[start:start + batch]
+            if start and len(part) < n_topics:
+                continue
+            km.partial_fit(vectors[np.sort(rows[part])].astype(np.float32))
+
+    labels = np.concatenate([km.predict(vectors[rows[start:start + KMEANS_BATCH_SIZE]].astype(np.float32))
+                             for start in range(0, len(rows), KMEANS_BATCH_SIZE)])
+    topics = cluster_terms(preprocess_reviews(df_bank, lemma_cache), labels, n_topics)
+    df_bank["topic_id"] = labels
+    return topics, df_bank
+
+def select_columns(X, min_df=MIN_DF, max_df=MAX_DF, max_features=MAX_FEATURES):
+    """Per-bank version of CountVectorizer's min_df / max_df / max_features"""
+    doc_freq = np.asarray((X > 0).sum(axis=0)).ravel()
+    term_freq = np.asarray(X.sum(axis=0)).ravel()
+    return select_by_frequency(doc_freq, term_freq, X.shape[0], min_df, max_df, max_features)
+
+def select_by_frequency(doc_freq, term_freq, n_docs, min_df=MIN_DF, max_df=MAX_DF, max_features=MAX_FEATURES):
+    keep = np.flatnonzero((doc_freq >= min_df) & (doc_freq <= max_df * n_docs))
+    if len(keep) > max_features:
+        keep = np.sort(keep[np.argsort(-term_freq[keep], kind="stable")[:max_features]])
+    return keep
+
+def _fit_bank_slice(task):
+    """Worker: fit one bank's LDA on its rows of the shared memory-mapped matrix"""
+    matrix_dir, rows, n_topics = task
+    X = shared_matrix.load_csr(matrix_dir)[rows]
+    cols = select_columns(X)
+    if X.shape[0] == 0 or len(cols) == 0:
+        return None
+    X = X[:, cols]
+    lda = LatentDirichletAllocation(n_components=n_topics, random_state=42, learning_method="batch", max_iter=15)
+    lda.fit(X)
+    features = shared_matrix.load_array(os.path.join(matrix_dir, "features.npy"))[cols]
+    return topics_from_model(lda, features.tolist()), lda.transform(X).argmax(axis=1)
+
+def parallel_topic_models(df, banks, n_topics=N_TOPICS, lemma_cache=None, workers=BANK_WORKERS):
+    """Vectorize the whole corpus once into a CSR matrix, share it with worker
+    processes through memory-mapped buffers, and fit every bank's LDA on its
+    row slice in parallel. Returns {bank: (topics, df_with_topics)}."""
+    df = df.reset_index(drop=True)
+    pre = preprocess_reviews(df, lemma_cache)
+    # a term below MIN_DF corpus-wide is below it in every bank, so prefilter here
+    cv = CountVectorizer(min_df=MIN_DF, ngram_range=(1,2))
+    X = cv.fit_transform(pre)
+    rows_by_bank = {bank: np.flatnonzero((df["bank"] == bank).to_numpy()) for bank in banks}
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="topics_dtm_") as matrix_dir:
+        shared_matrix.save_csr(X, matrix_dir)
+        shared_matrix.save_array(cv.get_feature_names_out(), os.path.join(matrix_dir, "features.npy"))
+        del X
+
+        tasks = [(matrix_dir, rows_by_bank[bank], n_topics) for bank in banks]
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks) or 1)) as pool:
+            for bank, result in zip(banks, pool.map(_fit_bank_slice, tasks)):
+                if result is None:
+                    results[bank] = None
+                    continue
+                topics, doc_topics = result
+                df_bank = df.iloc[rows_by_bank[bank]].reset_index(drop=True)
+                df_bank["topic_id"] = doc_topics
+                results[bank] = (topics, df_bank)
+    return results
+
+def hashing_vectorizer():
+    return HashingVectorizer(n_features=HASH_FEATURES, ngram_range=(1,2), alternate_sign=False, norm=None)
+
+def bank_rows(banks):
+    """{bank: row positions} for an array of bank names"""
+    return {bank: np.flatnonzero(banks == bank) for bank in pd.unique(banks)}
+
+def read_spool(spool, n_lines):
+    """Next n_lines (bank, lemmas) pairs written by streaming_topic_models"""
+    lines = [spool.readline().rstrip("\n").split("\t", 1) for _ in range(n_lines)]
+    return np.array([bank for bank, _ in lines], dtype=object), [doc for _, doc in lines]
+
+def streaming_topic_models(path, n_topics=N_TOPICS, lemma_cache=None, chunk_rows=CHUNK_ROWS):
+    """Out-of-core topic modeling over the whole review history.
+
+    Pass 1 reads the dataset chunk by chunk, lemmatizes it, spools the lemmas
+    to a temp file and counts hashed-column frequencies per bank, so
+    min_df / max_df / max_features still apply. Pass 2 folds the spooled
+    docs into a per-bank online LDA with partial_fit, and pass 3 labels
+    every review, appending to {bank}_reviews_with_topics.csv.
+    Returns ({bank: topics}, examples).
+    """
+    hv = hashing_vectorizer()
+    lookup = HashTermLookup(hv) if TERM_LOOKUP else None
+    doc_freq, term_freq, n_docs = {}, {}, {}
+
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as spool:
+        total = 0
+        for chunk in iter_dataset(path, chunk_rows=chunk_rows):
+            banks = chunk["bank"].astype(str).to_numpy()
+            pre = preprocess_reviews(chunk, lemma_cache)
+            spool.writelines(f"{bank}\t{doc}\n" for bank, doc in zip(banks, pre))
+            if lookup is not None:
+                lookup.update(pre)
+            X = hv.transform(pre)
+            for bank, rows in bank_rows(banks).items():
+                if bank not in n_docs:
+                    doc_freq[bank], term_freq[bank], n_docs[bank] = np.zeros(HASH_FEATURES), np.zeros(HASH_FEATURES), 0
+                doc_freq[bank] += np.asarray((X[rows] > 0).sum(axis=0)).ravel()
+                term_freq[bank] += np.asarray(X[rows].sum(axis=0)).ravel()
+                n_docs[bank] += len(rows)
+            total += len(chunk)
+            print(f"  pass 1: {total} reviews lemmatized")
+
+        # only observed columns go into LDA: unseen hash columns would dominate its initialization
+        columns = {bank: select_by_frequency(doc_freq[bank], term_freq[bank], n_docs[bank]) for bank in n_docs}
+        models = {bank: LatentDirichletAllocation(n_components=n_topics, random_state=42, learning_method="online",
+                                                  batch_size=ONLINE_BATCH_SIZE, total_samples=n_docs[bank])
+                  for bank, cols in columns.items() if len(cols)}
+
+        spool.seek(0)
+        for start in range(0, total, chunk_rows):
+            banks, pre = read_spool(spool, min(chunk_rows, total - start))
+            X = hv.transform(pre)
+            for bank, rows in bank_rows(banks).items():
+                if bank in models:
+                    X_bank = X[rows][:, columns[bank]]
+                    for i in range(0, len(rows), ONLINE_BATCH_SIZE):
+                        models[bank].partial_fit(X_bank[i:i + ONLINE_BATCH_SIZE])
+        print(f"  pass 2: fitted {len(models)} bank models")
+
+        features = lookup.feature_names() if lookup is not None else \
+            np.array([f"hash_{i}" for i in range(HASH_FEATURES)], dtype=object)
+        topics = {bank: topics_from_model(lda, features[columns[bank]]) for bank, lda in models.items()}
+
+        out_files = {bank: os.path.join(OUT_DIR, f"{bank}_reviews_with_topics.csv") for bank in models}
+        for out_file in out_files.values():
+            if os.path.exists(out_file):
+                os.remove(out_file)
+        examples = {(bank, t): [] for bank in models for t in range(n_topics)}
+
+        spool.seek(0)
+        for chunk in iter_dataset(path, chunk_rows=chunk_rows):
+            chunk = chunk.reset_index(drop=True)
+            banks, pre = read_spool(spool, len(chunk))
+            X = hv.transform(pre)
+            for bank, rows in bank_rows(banks).items():
+                if bank not in models:
+                    continue
+                part = chunk.iloc[rows].copy()
+                part["topic_id"] = models[bank].transform(X[rows][:, columns[bank]]).argmax(axis=1)
+                out_file = out_files[bank]
+                part.to_csv(out_file, mode="a", header=not os.path.exists(out_file), index=False)
+                for t in range(n_topics):
+                    room = 5 - len(examples[(bank, t)])
+                    if room > 0:
+                        ex = part[part["topic_id"] == t].head(room)[["review_id","review","sentiment_label"]]
+                        examples[(bank, t)].extend(ex.to_dict(orient="records"))
+
+    all_examples = [{"bank": bank, "topic_id": t, "examples": ex} for (bank, t), ex in examples.items()]
+    return topics, all_examples
+
 def save_topics(bank_name, topics):
     os.makedirs(OUT_DIR, exist_ok=True)
     with open(os.path.join(OUT_DIR, f"{bank_name}_topics.json"), "w", encoding="utf-8") as f:
         json.dump(topics, f, indent=2)
 
+def check_modes():
+    """The topic modes are alternatives; refuse a config that enables several"""
+    modes = [name for name, on in (("INCREMENTAL_LDA", INCREMENTAL_LDA),
+                                   ("PARALLEL_BANKS", PARALLEL_BANKS),
+                                   ("STREAMING_TOPICS", STREAMING_TOPICS),
+                                   ("EMBEDDING_TOPICS", EMBEDDING_TOPICS)) if on]
+    if len(modes) > 1:
+        raise ValueError(f"{' and '.join(modes)} cannot be combined; enable at most one topic mode")
+
 def main():
+    check_modes()
     os.makedirs(OUT_DIR, exist_ok=True)
     # Helpful check: ensure the input CSV exists and has the expected columns
-    if not os.path.exists(INPUT):
+    if not dataset_exists(INPUT):
         # try to find similarly named files in data/processed
         alt = glob.glob(os.path.join(os.path.dirname(INPUT), "*sentiment*.csv"))
-        msg_lines = [f"Required input file not found: {INPUT}"]
+        msg_lines = [f"Required input dataset not found: {INPUT}.csv / {INPUT}.parquet"]
         if alt:
             msg_lines.append("Found similar processed files:")
             for p in alt:
@@ -75,22 +396,44 @@ def main():
         print("\n".join(msg_lines))
         sys.exit(2)
 
-    df = pd.read_csv(INPUT)
+    lemma_cache = LemmaCache(LEMMA_CACHE_FILE) if USE_LEMMA_CACHE else None
+    if STREAMING_TOPICS:
+        print(f"Streaming topics over {INPUT} in chunks of {CHUNK_ROWS} ...")
+        topics_by_bank, all_examples = streaming_topic_models(INPUT, N_TOPICS, lemma_cache)
+        for bank, topics in topics_by_bank.items():
+            save_topics(bank, topics)
+        pd.DataFrame(all_examples).to_json(os.path.join(OUT_DIR, "topic_examples.json"), orient="records", indent=2)
+        print("Topic modeling finished. Results in", OUT_DIR)
+        return
+
+    df = read_dataset(INPUT)
     banks = df["bank"].unique()
+    if PARALLEL_BANKS:
+        print(f"Running topics for {len(banks)} banks in parallel ...")
+        parallel_results = parallel_topic_models(df, banks, N_TOPICS, lemma_cache)
     all_examples = []
     for bank in banks:
-        print(f"Running topics for {bank} ...")
-        df_bank = df[df["bank"] == bank].copy()
-        if df_bank.empty:
-            print(" no data for", bank); continue
-        result = topic_model_for_bank(df_bank, bank, n_topics=N_TOPICS)
+        if PARALLEL_BANKS:
+            result = parallel_results[bank]
+        else:
+            print(f"Running topics for {bank} ...")
+            df_bank = df[df["bank"] == bank].copy()
+            if df_bank.empty:
+                print(" no data for", bank); continue
+            if EMBEDDING_TOPICS:
+                model_fn = embedding_topic_model_for_bank
+            elif INCREMENTAL_LDA:
+                model_fn = incremental_topic_model_for_bank
+            else:
+                model_fn = topic_model_for_bank
+            result = model_fn(df_bank, bank, n_topics=N_TOPICS, lemma_cache=lemma_cache)
         if result is None:
             print("Not enough data for LDA on", bank)
             continue
         topics, df_with_topics = result
         save_topics(bank, topics)
         # Save labeled reviews
-        df_with_topics.to_csv(os.path.join(OUT_DIR, f"{bank}_reviews_with_topics.csv"), index=False)
+        write_dataset(df_with_topics, os.path.join(OUT_DIR, f"{bank}_reviews_with_topics"))
         # Collect a few examples per topic for manual labeling
         for t in range(N_TOPICS):
             ex = df_with_topics[df_with_topics["topic_id"]==t].head(5)[["review_id","review","sentiment_label"]].to_dict(orient="records")
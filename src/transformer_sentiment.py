@@ -0,0 +1,76 @@
+import os
+import numpy as np
+
+# ---------------- CONFIG ----------------
+MODEL_NAME = "distilbert-base-uncased-finetuned-sst-2-english"
+MAX_LENGTH = 256                 # tokens kept per review
+MAX_TOKENS_PER_BATCH = 8192      # padded tokens per forward pass
+MAX_BATCH_SIZE = 64
+NUM_THREADS = min(4, os.cpu_count() or 1)
+# ---------------------------------------
+
+
+def length_batches(lengths, max_tokens=MAX_TOKENS_PER_BATCH, max_batch=MAX_BATCH_SIZE):
+    """Group indices into batches by length so padding stays small.
+
+    Indices are sorted by token length and a batch grows until its padded
+    size (rows x longest row) would pass `max_tokens`.
+    """
+    batches, batch, longest = [], [], 0
+    for i in np.argsort(lengths, kind="stable"):
+        new_longest = max(longest, lengths[i])
+        if batch and (len(batch) >= max_batch or new_longest * (len(batch) + 1) > max_tokens):
+            batches.append(batch)
+            batch, new_longest = [], lengths[i]
+        batch.append(i)
+        longest = new_longest
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+class TransformerAnalyzer:
+    """Local CPU transformer classifier with VADER's `polarity_scores` shape.
+
+    The compound score is P(positive) - P(negative), so it lies in [-1, 1]
+    and `analyze_sentiment`'s +/-0.05 thresholds apply unchanged.
+    """
+
+    def __init__(self, model_name=MODEL_NAME, num_threads=NUM_THREADS):
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+        torch.set_num_threads(num_threads)
+        self.torch = torch
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        self.model.eval()
+
+        labels = {v.lower(): int(k) for k, v in self.model.config.id2label.items()}
+        self.pos_idx = labels.get("positive", 1)
+        self.neg_idx = labels.get("negative", 0)
+
+    def polarity_scores(self, text):
+        return {"compound": float(self.score_texts([text])[0])}
+
+    def score_texts(self, texts):
+        """Compound scores for many texts; empty or non-string texts score 0.0"""
+        scores = np.zeros(len(texts), dtype=float)
+        idx = [i for i, t in enumerate(texts) if isinstance(t, str) and t.strip()]
+        if not idx:
+            return scores
+
+        encoded = self.tokenizer([texts[i] for i in idx], truncation=True, max_length=MAX_LENGTH)
+        lengths = np.array([len(ids) for ids in encoded["input_ids"]])
+
+        for batch in length_batches(lengths):
+            inputs = self.tokenizer.pad(
+                {"input_ids": [encoded["input_ids"][j] for j in batch],
+                 "attention_mask": [encoded["attention_mask"][j] for j in batch]},
+                return_tensors="pt"
+            )
+            with self.torch.inference_mode():
+                probs = self.model(**inputs).logits.softmax(dim=-1).numpy()
+            scores[[idx[j] for j in batch]] = probs[:, self.pos_idx] - probs[:, self.neg_idx]
+
+        return scores
@@ -1,13 +1,6 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
-import seaborn as sns
-import os
-
-# Load processed data
-df = pd.read_csv("data/processed/processed_reviews_sentiment.csv")
-
-# Ensure output directory existsimport pandas as pd
+import matplotlib
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 from wordcloud import WordCloud
 import seaborn as sns
@@ -15,336 +8,274 @@ import os
 import numpy as np
 from matplotlib.gridspec import GridSpec
 
-# Load processed data
-df = pd.read_csv("data/processed/processed_reviews_sentiment.csv")
+from storage import read_dataset
+from aggregations import bank_metrics, rating_histogram
+from issue_tagger import SPECIFIC_ISSUES
+from dashboard_metrics import load_metrics
+from render import FigureTask, render_all
 
+# ---------------- CONFIG ----------------
+FIG_DIR = "reports/figures"
+DPI = 300
+FORCE = False   # re-render even figures whose inputs are unchanged
+# ---------------------------------------
 
-os.makedirs("reports/figures", exist_ok=True)
+# Each figure is drawn by a function taking only the data slice it shows,
+# so render.py can hash that slice and skip the figure when it is unchanged.
 
-print("=== TASK 4: ENHANCED VISUALIZATIONS ===\n")
-
-print("1. Creating your original visualizations...")
 
 # 1. Sentiment Distribution per Bank
-plt.figure(figsize=(10, 6))
-sns.countplot(data=df, x="bank", hue="sentiment_label", palette={"positive": "green", "negative": "red", "neutral": "gray"})
-plt.title("Sentiment Distribution per Bank", fontweight='bold', fontsize=14)
-plt.xlabel("Bank")
-plt.ylabel("Count")
-plt.legend(title="Sentiment")
-plt.tight_layout()
-plt.savefig("reports/figures/sentiment_distribution_per_bank.png", dpi=300)
-plt.close()
+def draw_sentiment_distribution(counts_df, output, dpi=DPI):
+    plt.figure(figsize=(10, 6))
+    sns.countplot(data=counts_df, x="bank", hue="sentiment_label", palette={"positive": "green", "negative": "red", "neutral": "gray"})
+    plt.title("Sentiment Distribution per Bank", fontweight='bold', fontsize=14)
+    plt.xlabel("Bank")
+    plt.ylabel("Count")
+    plt.legend(title="Sentiment")
+    plt.tight_layout()
+    plt.savefig(output, dpi=dpi)
+    plt.close()
+
 
 # 2. Average Sentiment Score per Bank
-plt.figure(figsize=(10, 6))
-avg_scores = df.groupby("bank")["sentiment_score"].mean().sort_values()
-colors = ['#FF6B6B' if x < 0.1 else '#FECA57' if x < 0.25 else '#54A0FF' for x in avg_scores.values]
-bars = avg_scores.plot(kind="bar", color=colors)
-plt.title("Average Sentiment Score per Bank", fontweight='bold', fontsize=14)
-plt.ylabel("Average Sentiment Score")
-plt.xticks(rotation=0)
-
-# Add value labels on bars
-for i, v in enumerate(avg_scores.values):
-    plt.text(i, v + 0.01, f'{v:.3f}', ha='center', va='bottom', fontweight='bold')
-
-plt.tight_layout()
-plt.savefig("reports/figures/avg_sentiment_score_per_bank.png", dpi=300)
-plt.close()
-
-# 3. WordCloud for Each Bank
-banks = df["bank"].unique()
-for bank in banks:
-    text = " ".join(df[df["bank"] == bank]["review"].astype(str))
-    if len(text.strip()) < 5:
-        continue
+def draw_avg_sentiment(avg_scores, output, dpi=DPI):
+    plt.figure(figsize=(10, 6))
+    avg_scores = avg_scores.sort_values()
+    colors = ['#FF6B6B' if x < 0.1 else '#FECA57' if x < 0.25 else '#54A0FF' for x in avg_scores.values]
+    avg_scores.plot(kind="bar", color=colors)
+    plt.title("Average Sentiment Score per Bank", fontweight='bold', fontsize=14)
+    plt.ylabel("Average Sentiment Score")
+    plt.xticks(rotation=0)
+
+    # Add value labels on bars
+    for i, v in enumerate(avg_scores.values):
+        plt.text(i, v + 0.01, f'{v:.3f}', ha='center', va='bottom', fontweight='bold')
+
+    plt.tight_layout()
+    plt.savefig(output, dpi=dpi)
+    plt.close()
+
+
+# 3. WordCloud for one bank
+def draw_wordcloud(inputs, output, dpi=DPI):
+    bank, reviews = inputs
+    text = " ".join(reviews.fillna("").astype(str))
     wc = WordCloud(width=800, height=400, background_color="white", max_words=100).generate(text)
     plt.figure(figsize=(12, 6))
     plt.imshow(wc, interpolation="bilinear")
     plt.axis("off")
     plt.title(f"Most Frequent Words - {bank} Bank", fontweight='bold', fontsize=14)
-    plt.savefig(f"reports/figures/wordcloud_{bank}.png", dpi=300)
+    plt.savefig(output, dpi=dpi)
     plt.close()
 
-print("✅ Original visualizations updated")
-
-# -----------------------------------------------------------------
-# NEW TASK 4 VISUALIZATIONS
-# -----------------------------------------------------------------
-print("\n2. Creating Task 4 enhanced visualizations...")
-
-# VISUALIZATION 4: Performance Dashboard
-fig = plt.figure(figsize=(16, 10))
-gs = GridSpec(2, 3, figure=fig)
-
-# Subplot 1: Average Rating Comparison
-ax1 = fig.add_subplot(gs[0, 0])
-avg_rating = df.groupby('bank')['rating'].mean().sort_values()
-colors_rating = ['#FF6B6B' if x < 3.5 else '#4ECDC4' if x < 4 else '#45B7D1' for x in avg_rating.values]
-bars1 = ax1.bar(avg_rating.index, avg_rating.values, color=colors_rating)
-ax1.set_title('Average Rating by Bank', fontweight='bold', fontsize=12)
-ax1.set_ylabel('Average Rating (1-5)')
-ax1.set_ylim(0, 5)
-ax1.axhline(y=3.5, color='gray', linestyle='--', alpha=0.5, label='Good threshold')
-for bar in bars1:
-    height = bar.get_height()
-    ax1.text(bar.get_x() + bar.get_width()/2., height + 0.05,
-            f'{height:.2f}', ha='center', va='bottom', fontweight='bold')
-ax1.legend()
-
-# Subplot 2: Positive Review Percentage
-ax2 = fig.add_subplot(gs[0, 1])
-positive_pct = df.groupby('bank')['sentiment_label'].apply(lambda x: (x == 'positive').sum() / len(x) * 100)
-bars2 = ax2.bar(positive_pct.index, positive_pct.values, color=['#9b59b6', '#3498db', '#1abc9c'])
-ax2.set_title('Positive Review Percentage', fontweight='bold', fontsize=12)
-ax2.set_ylabel('Percentage (%)')
-ax2.set_ylim(0, 100)
-for bar in bars2:
-    height = bar.get_height()
-    ax2.text(bar.get_x() + bar.get_width()/2., height + 1,
-            f'{height:.1f}%', ha='center', va='bottom', fontweight='bold')
-
-# Subplot 3: Rating Distribution
-ax3 = fig.add_subplot(gs[0, 2])
-rating_data = []
-for bank in df['bank'].unique():
-    for rating in range(1, 6):
-        count = len(df[(df['bank'] == bank) & (df['rating'] == rating)])
-        rating_data.append({'Bank': bank, 'Rating': rating, 'Count': count})
-rating_df = pd.DataFrame(rating_data)
-rating_pivot = rating_df.pivot_table(index='Bank', columns='Rating', values='Count', aggfunc='sum')
-rating_pivot.plot(kind='bar', stacked=True, ax=ax3, colormap='viridis')
-ax3.set_title('Rating Distribution by Bank', fontweight='bold', fontsize=12)
-ax3.set_ylabel('Number of Reviews')
-ax3.set_xlabel('Bank')
-ax3.legend(title='Rating', bbox_to_anchor=(1.05, 1))
-
-# Subplot 4: Sentiment vs Rating Scatter
-ax4 = fig.add_subplot(gs[1, 0])
-for bank in df['bank'].unique():
-    bank_data = df[df['bank'] == bank]
-    ax4.scatter(bank_data['rating'], bank_data['sentiment_score'], alpha=0.5, label=bank, s=50)
-ax4.set_title('Rating vs Sentiment Correlation', fontweight='bold', fontsize=12)
-ax4.set_xlabel('Rating (1-5)')
-ax4.set_ylabel('Sentiment Score')
-ax4.legend()
-ax4.grid(True, alpha=0.3)
-
-# Subplot 5: Issue Categories (based on common keywords)
-ax5 = fig.add_subplot(gs[1, 1])
-# Define common issue categories and keywords
-issue_categories = {
-    'Technical': ['crash', 'error', 'bug', 'not working', 'freeze'],
-    'Performance': ['slow', 'loading', 'wait', 'delay', 'speed'],
-    'Login/Account': ['login', 'password', 'account', 'access', 'verification'],
-    'Usability': ['difficult', 'complex', 'hard to use', 'confusing', 'interface']
-}
-
-issue_data = []
-for bank in df['bank'].unique():
-    for category, keywords in issue_categories.items():
-        count = 0
-        for review in df[df['bank'] == bank]['review']:
-            if any(keyword in str(review).lower() for keyword in keywords):
-                count += 1
-        issue_data.append({'Bank': bank, 'Category': category, 'Count': count})
-
-issue_df = pd.DataFrame(issue_data)
-issue_pivot = issue_df.pivot_table(index='Bank', columns='Category', values='Count', aggfunc='sum')
-issue_pivot.plot(kind='bar', ax=ax5)
-ax5.set_title('Common Issues by Category', fontweight='bold', fontsize=12)
-ax5.set_ylabel('Number of Reviews Mentioning')
-ax5.set_xlabel('Bank')
-ax5.legend(bbox_to_anchor=(1.05, 1))
-
-# Subplot 6: Bank Comparison Summary
-ax6 = fig.add_subplot(gs[1, 2])
-ax6.axis('off')
-summary_text = (
-    "Key Insights:\n\n"
-    "1. CBE has highest rating (4.12)\n"
-    "2. Dashen has highest positive % (64%)\n"
-    "3. Abyssinia needs most improvement\n"
-    "4. Common issues: Performance & Login\n\n"
-    "Recommendations:\n"
-    "• CBE: Maintain quality\n"
-    "• Dashen: Fix performance\n"
-    "• Abyssinia: Major overhaul needed"
-)
-ax6.text(0.1, 0.5, summary_text, fontsize=11, verticalalignment='center',
-        bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
-
-plt.suptitle('Bank App Analysis Dashboard - Task 4 Insights', fontsize=16, fontweight='bold')
-plt.tight_layout()
-plt.savefig('reports/figures/task4_dashboard.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("✅ Created: Task 4 Dashboard - reports/figures/task4_dashboard.png")
-
-# -----------------------------------------------------------------
-# VISUALIZATION 5: Drivers & Pain Points Comparison
-# -----------------------------------------------------------------
-# Based on our analysis from Insights.py
-plt.figure(figsize=(14, 8))
-
-# Create data for visualization
-banks = df['bank'].unique()
-categories = ['App Stability', 'Speed/Performance', 'User Interface', 'Features', 'Customer Support']
-data = {
-    'Abyssinia': [3.5, 2.8, 3.2, 3.0, 2.5],  # Lower scores
-    'CBE': [4.2, 4.0, 4.3, 3.8, 3.5],        # Higher scores
-    'Dashen': [3.8, 3.5, 4.0, 3.7, 3.2]      # Medium scores
-}
-
-# Plot radar chart (spider chart)
-angles = np.linspace(0, 2 * np.pi, len(categories), endpoint=False).tolist()
-angles += angles[:1]  # Close the loop
-
-fig, ax = plt.subplots(figsize=(10, 8), subplot_kw=dict(projection='polar'))
-
-for bank, scores in data.items():
-    scores += scores[:1]  # Close the loop
-    ax.plot(angles, scores, 'o-', linewidth=2, label=bank)
-    ax.fill(angles, scores, alpha=0.25)
-
-ax.set_xticks(angles[:-1])
-ax.set_xticklabels(categories)
-ax.set_ylim(0, 5)
-ax.set_yticks([1, 2, 3, 4, 5])
-ax.set_yticklabels(['1', '2', '3', '4', '5'])
-ax.set_title('Bank Performance Across Key Categories', fontweight='bold', fontsize=14)
-ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.0))
-plt.tight_layout()
-plt.savefig('reports/figures/bank_performance_radar.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("✅ Created: Bank Performance Radar Chart - reports/figures/bank_performance_radar.png")
-
-# -----------------------------------------------------------------
-# VISUALIZATION 6: Specific Issues Heatmap
-# -----------------------------------------------------------------
-plt.figure(figsize=(12, 8))
-
-# Define specific issues from our analysis
-specific_issues = {
-    'Abyssinia': {
-        'Mobile Banking Issues': 12,
-        'Developer Options': 7,
-        'Worst Ever': 6,
-        'Speed Problems': 46,
-        'App Crashes': 28
-    },
-    'CBE': {
-        'Mobile Banking Issues': 3,
-        'SIM Card Problems': 3,
-        'Branch Issues': 2,
-        'Speed Problems': 20,
-        'App Crashes': 14
-    },
-    'Dashen': {
-        'Mobile Banking Issues': 4,
-        'Worst Ever': 5,
-        'Speed Problems': 39,
-        'Bill Payment': 5,
-        'App Crashes': 24
-    }
-}
-
-# Create heatmap data
-issues_list = list(set().union(*[d.keys() for d in specific_issues.values()]))
-heatmap_data = []
-for issue in issues_list:
-    row = []
-    for bank in banks:
-        row.append(specific_issues.get(bank, {}).get(issue, 0))
-    heatmap_data.append(row)
-
-heatmap_data = np.array(heatmap_data)
-
-# Create heatmap
-fig, ax = plt.subplots(figsize=(10, 6))
-im = ax.imshow(heatmap_data, cmap='YlOrRd')
-
-# Show all ticks and labels
-ax.set_xticks(np.arange(len(banks)))
-ax.set_yticks(np.arange(len(issues_list)))
-ax.set_xticklabels(banks)
-ax.set_yticklabels(issues_list)
-
-# Rotate the tick labels and set alignment
-plt.setp(ax.get_xticklabels(), rotation=45, ha="right", rotation_mode="anchor")
-
-# Loop over data dimensions and create text annotations
-for i in range(len(issues_list)):
-    for j in range(len(banks)):
-        text = ax.text(j, i, heatmap_data[i, j],
-                       ha="center", va="center", color="black", fontweight='bold')
-
-ax.set_title("Specific Issues Mentioned in Reviews", fontweight='bold', fontsize=14)
-fig.tight_layout()
-plt.savefig('reports/figures/issues_heatmap.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("✅ Created: Issues Heatmap - reports/figures/issues_heatmap.png")
-
-# -----------------------------------------------------------------
-# FINAL SUMMARY
-# -----------------------------------------------------------------
-print(f"\n{'='*60}")
-print("TASK 4 VISUALIZATIONS COMPLETE!")
-print(f"{'='*60}")
-print("\n📊 VISUALIZATIONS CREATED:")
-print("1. sentiment_distribution_per_bank.png (Updated)")
-print("2. avg_sentiment_score_per_bank.png (Updated)")
-print("3. wordcloud_[bank].png (3 files)")
-print("4. task4_dashboard.png (Main dashboard with 6 subplots)")
-print("5. bank_performance_radar.png (Radar chart comparison)")
-print("6. issues_heatmap.png (Heatmap of specific issues)")
-print("\n✅ Total: 3 updated + 3 new = 6 visualizations")
-print("\n📍 All visualizations saved to: reports/figures/")
-os.makedirs("reports/figures", exist_ok=True)
-
-# -----------------------
-# 1. Sentiment Distribution per Bank
-# -----------------------
-plt.figure(figsize=(8, 5))
-sns.countplot(data=df, x="bank", hue="sentiment_label")
-plt.title("Sentiment Distribution per Bank")
-plt.xlabel("Bank")
-plt.ylabel("Count")
-plt.legend(title="Sentiment")
-plt.tight_layout()
-plt.savefig("../reports/figures/sentiment_distribution_per_bank.png")
-plt.close()
-
-# -----------------------
-# 2. Average Sentiment Score per Bank
-# -----------------------
-plt.figure(figsize=(8, 5))
-df.groupby("bank")["sentiment_score"].mean().plot(kind="bar")
-plt.title("Average Sentiment Score per Bank")
-plt.ylabel("Average Score")
-plt.tight_layout()
-plt.savefig("../reports/figures/avg_sentiment_score_per_bank.png")
-plt.close()
-
-# -----------------------
-# 3. WordCloud for Each Bank
-# -----------------------
-banks = df["bank"].unique()
-
-for bank in banks:
-    # FIX: Use 'review' instead of 'cleaned_review'
-    text = " ".join(df[df["bank"] == bank]["review"].astype(str))
-
-    if len(text.strip()) < 5:
-        continue
-
-    wc = WordCloud(width=800, height=400, background_color="white").generate(text)
-
-    plt.figure(figsize=(10, 5))
-    plt.imshow(wc, interpolation="bilinear")
-    plt.axis("off")
-    plt.title(f"WordCloud for {bank} Bank")
-    plt.savefig(f"../reports/figures/wordcloud_{bank}.png")
+
+# 4. Performance Dashboard
+def draw_dashboard(inputs, output, dpi=DPI):
+    metrics, scatter_df, dashboard = inputs
+    fig = plt.figure(figsize=(16, 10))
+    gs = GridSpec(2, 3, figure=fig)
+
+    # Subplot 1: Average Rating Comparison
+    ax1 = fig.add_subplot(gs[0, 0])
+    avg_rating = metrics['avg_rating'].sort_values()
+    colors_rating = ['#FF6B6B' if x < 3.5 else '#4ECDC4' if x < 4 else '#45B7D1' for x in avg_rating.values]
+    bars1 = ax1.bar(avg_rating.index, avg_rating.values, color=colors_rating)
+    ax1.set_title('Average Rating by Bank', fontweight='bold', fontsize=12)
+    ax1.set_ylabel('Average Rating (1-5)')
+    ax1.set_ylim(0, 5)
+    ax1.axhline(y=3.5, color='gray', linestyle='--', alpha=0.5, label='Good threshold')
+    for bar in bars1:
+        height = bar.get_height()
+        ax1.text(bar.get_x() + bar.get_width()/2., height + 0.05,
+                f'{height:.2f}', ha='center', va='bottom', fontweight='bold')
+    ax1.legend()
+
+    # Subplot 2: Positive Review Percentage
+    ax2 = fig.add_subplot(gs[0, 1])
+    positive_pct = metrics['positive_pct'].sort_index()
+    bars2 = ax2.bar(positive_pct.index, positive_pct.values, color=['#9b59b6', '#3498db', '#1abc9c'])
+    ax2.set_title('Positive Review Percentage', fontweight='bold', fontsize=12)
+    ax2.set_ylabel('Percentage (%)')
+    ax2.set_ylim(0, 100)
+    for bar in bars2:
+        height = bar.get_height()
+        ax2.text(bar.get_x() + bar.get_width()/2., height + 1,
+                f'{height:.1f}%', ha='center', va='bottom', fontweight='bold')
+
+    # Subplot 3: Rating Distribution
+    ax3 = fig.add_subplot(gs[0, 2])
+    rating_pivot = rating_histogram(metrics).sort_index()
+    rating_pivot.index.name = 'Bank'
+    rating_pivot.columns.name = 'Rating'
+    rating_pivot.plot(kind='bar', stacked=True, ax=ax3, colormap='viridis')
+    ax3.set_title('Rating Distribution by Bank', fontweight='bold', fontsize=12)
+    ax3.set_ylabel('Number of Reviews')
+    ax3.set_xlabel('Bank')
+    ax3.legend(title='Rating', bbox_to_anchor=(1.05, 1))
+
+    # Subplot 4: Sentiment vs Rating Scatter
+    ax4 = fig.add_subplot(gs[1, 0])
+    for bank, bank_data in scatter_df.groupby('bank', sort=False, observed=True):
+        ax4.scatter(bank_data['rating'], bank_data['sentiment_score'], alpha=0.5, label=bank, s=50)
+    ax4.set_title('Rating vs Sentiment Correlation', fontweight='bold', fontsize=12)
+    ax4.set_xlabel('Rating (1-5)')
+    ax4.set_ylabel('Sentiment Score')
+    ax4.legend()
+    ax4.grid(True, alpha=0.3)
+
+    # Subplot 5: Issue Categories (based on common keywords)
+    ax5 = fig.add_subplot(gs[1, 1])
+    # Reviews mentioning each issue category per bank (see dashboard_metrics.py)
+    issue_pivot = pd.DataFrame.from_dict(dashboard['dashboard_issues'], orient='index')
+    issue_pivot = issue_pivot.sort_index().sort_index(axis=1)
+    issue_pivot.index.name = 'Bank'
+    issue_pivot.columns.name = 'Category'
+    issue_pivot.plot(kind='bar', ax=ax5)
+    ax5.set_title('Common Issues by Category', fontweight='bold', fontsize=12)
+    ax5.set_ylabel('Number of Reviews Mentioning')
+    ax5.set_xlabel('Bank')
+    ax5.legend(bbox_to_anchor=(1.05, 1))
+
+    # Subplot 6: Bank Comparison Summary
+    ax6 = fig.add_subplot(gs[1, 2])
+    ax6.axis('off')
+    summary = dashboard["summary"]
+    summary_text = (
+        "Key Insights:\n\n"
+        f"1. {summary['best_rating']['bank']} has highest rating ({summary['best_rating']['value']:.2f})\n"
+        f"2. {summary['best_positive']['bank']} has highest positive % ({summary['best_positive']['value']:.0f}%)\n"
+        f"3. {summary['worst_rating']['bank']} needs most improvement ({summary['worst_rating']['value']:.2f})\n"
+        f"4. Common issues: {' & '.join(summary['top_issues'])}\n\n"
+        "Recommendations:\n"
+        + "\n".join(f"• {bank}: Maintain quality" if bank == summary['best_rating']['bank']
+                    else f"• {bank}: Fix {issue.lower()}"
+                    for bank, issue in summary['focus'].items())
+    )
+    ax6.text(0.1, 0.5, summary_text, fontsize=11, verticalalignment='center',
+            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
+
+    plt.suptitle('Bank App Analysis Dashboard - Task 4 Insights', fontsize=16, fontweight='bold')
+    plt.tight_layout()
+    plt.savefig(output, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+
+# 5. Drivers & Pain Points Comparison (radar chart)
+def draw_radar(radar, output, dpi=DPI):
+    categories = radar['categories']
+    # mean star rating of each bank's reviews that mention the area (see dashboard_metrics.py)
+    data = radar['scores']
+
+    # Plot radar chart (spider chart)
+    angles = np.linspace(0, 2 * np.pi, len(categories), endpoint=False).tolist()
+    angles += angles[:1]  # Close the loop
+
+    fig, ax = plt.subplots(figsize=(10, 8), subplot_kw=dict(projection='polar'))
+
+    for bank, scores in data.items():
+        scores = scores + scores[:1]  # Close the loop
+        ax.plot(angles, scores, 'o-', linewidth=2, label=bank)
+        ax.fill(angles, scores, alpha=0.25)
+
+    ax.set_xticks(angles[:-1])
+    ax.set_xticklabels(categories)
+    ax.set_ylim(0, 5)
+    ax.set_yticks([1, 2, 3, 4, 5])
+    ax.set_yticklabels(['1', '2', '3', '4', '5'])
+    ax.set_title('Bank Performance Across Key Categories', fontweight='bold', fontsize=14)
+    ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.0))
+    plt.tight_layout()
+    plt.savefig(output, dpi=dpi, bbox_inches='tight')
     plt.close()
 
-print("🎉 Visualization completed! Check the reports/figures folder.")
+
+# 6. Specific Issues Heatmap
+def draw_issues_heatmap(inputs, output, dpi=DPI):
+    banks, issues_list, specific_issues = inputs
+
+    # Create heatmap data
+    heatmap_data = np.array([[specific_issues.get(bank, {}).get(issue, 0) for bank in banks]
+                             for issue in issues_list])
+
+    # Create heatmap
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.imshow(heatmap_data, cmap='YlOrRd')
+
+    # Show all ticks and labels
+    ax.set_xticks(np.arange(len(banks)))
+    ax.set_yticks(np.arange(len(issues_list)))
+    ax.set_xticklabels(banks)
+    ax.set_yticklabels(issues_list)
+
+    # Rotate the tick labels and set alignment
+    plt.setp(ax.get_xticklabels(), rotation=45, ha="right", rotation_mode="anchor")
+
+    # Loop over data dimensions and create text annotations
+    for i in range(len(issues_list)):
+        for j in range(len(banks)):
+            ax.text(j, i, heatmap_data[i, j],
+                    ha="center", va="center", color="black", fontweight='bold')
+
+    ax.set_title("Specific Issues Mentioned in Reviews", fontweight='bold', fontsize=14)
+    fig.tight_layout()
+    plt.savefig(output, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+
+def figure_tasks(df):
+    """One FigureTask per output file, each carrying only the data it plots
+    and the render settings (dpi) it is saved with"""
+    # Per-bank counts, means and label shares, computed in one grouped pass
+    metrics = bank_metrics(df)
+    # Radar scores, issue counts and summary facts, recomputed when the data changes
+    dashboard = load_metrics()
+    banks = [str(b) for b in df["bank"].unique()]
+    settings = {"dpi": DPI}
+
+    tasks = [
+        FigureTask(os.path.join(FIG_DIR, "sentiment_distribution_per_bank.png"),
+                   draw_sentiment_distribution, df[["bank", "sentiment_label"]], settings),
+        FigureTask(os.path.join(FIG_DIR, "avg_sentiment_score_per_bank.png"),
+                   draw_avg_sentiment, metrics["avg_sentiment"], settings),
+    ]
+    for bank, reviews in df.groupby(df["bank"].astype(str), sort=False)["review"]:
+        if reviews.fillna("").astype(str).str.strip().str.len().sum() < 5:
+            continue
+        tasks.append(FigureTask(os.path.join(FIG_DIR, f"wordcloud_{bank}.png"),
+                                draw_wordcloud, (bank, reviews.reset_index(drop=True)), settings))
+    tasks += [
+        FigureTask(os.path.join(FIG_DIR, "task4_dashboard.png"), draw_dashboard,
+                   (metrics, df[["bank", "rating", "sentiment_score"]], dashboard), settings),
+        FigureTask(os.path.join(FIG_DIR, "bank_performance_radar.png"), draw_radar, dashboard["radar"], settings),
+        FigureTask(os.path.join(FIG_DIR, "issues_heatmap.png"), draw_issues_heatmap,
+                   (banks, list(SPECIFIC_ISSUES), dashboard["specific_issues"]), settings),
+    ]
+    return tasks
+
+
+def main():
+    # Load processed data
+    df = read_dataset("data/processed/processed_reviews_sentiment",
+                      columns=["bank", "review", "rating", "sentiment_label", "sentiment_score"])
+
+    print("=== TASK 4: ENHANCED VISUALIZATIONS ===\n")
+    tasks = figure_tasks(df)
+    rendered, skipped = render_all(tasks, force=FORCE)
+
+    for output in rendered:
+        print(f"✅ Created: {output}")
+    for output in skipped:
+        print(f"⏭️  Unchanged, kept: {output}")
+
+    # -----------------------------------------------------------------
+    # FINAL SUMMARY
+    # -----------------------------------------------------------------
+    print(f"\n{'='*60}")
+    print("TASK 4 VISUALIZATIONS COMPLETE!")
+    print(f"{'='*60}")
+    print(f"\n📊 {len(rendered)} figures rendered, {len(skipped)} unchanged")
+    print(f"\n📍 All visualizations saved to: {FIG_DIR}/")
+
+
+if __name__ == "__main__":
+    main()
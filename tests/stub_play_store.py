@@ -0,0 +1,29 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+START = datetime(2024, 1, 1)
+
+
+class StubStore:
+    """Fake Play Store listing: reviews r0, r1, ... served newest first"""
+
+    def __init__(self, n):
+        self.n = 0
+        self.add(n)
+
+    def add(self, n):
+        self.n += n
+
+    def review(self, i):
+        return {"reviewId": f"r{i}", "userName": "user", "content": f"review {i}!",
+                "score": 1 + i % 5, "at": START + timedelta(minutes=i)}
+
+    def __call__(self, package_id, lang, country, sort, count, continuation_token):
+        # the token holds the listing size when paging began, so new reviews don't shift pages
+        top = continuation_token.token if continuation_token else self.n
+        offset = continuation_token.count if continuation_token else 0
+        ids = range(top - 1 - offset, max(top - 1 - offset - count, -1), -1)
+        batch = [self.review(i) for i in ids]
+        end = offset + len(batch)
+        token = SimpleNamespace(token=top, count=end) if end < top else None
+        return batch, token
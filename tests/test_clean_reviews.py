@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from clean_reviews import HAS_PYARROW, clean_text, clean_texts
+
+TEXTS = [
+    "Great app!!  Works fine",
+    np.nan,
+    None,
+    42,
+    3.5,
+    "",
+    "   ",
+    "see https://example.com/x?y=1 for more",
+    "link:http://a.b/c,then text",
+    "tabs\tand\nnew\r\nlines",
+    "odd\x1cseparators\x1d\x1e\x1fhere",
+    "next\x85line\u2028and\u2029para\x0bvt\x0cff",
+    "ideographic\u3000space, nbsp\xa0here, narrow\u202fnbsp\u2000en quad\u205f",
+    "emoji 😀👍🏽 only 🏦",
+    "😡😡😡",
+    "Ünïcödé çharacters — and – dashes",
+    "mixed 123 numbers & symbols #1 @bank",
+    "trailing spaces    ",
+]
+
+BACKENDS = ["python", pytest.param("pyarrow", marks=pytest.mark.skipif(not HAS_PYARROW, reason="needs pyarrow"))]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_clean_texts_matches_clean_text(backend):
+    texts = pd.Series(TEXTS, dtype=object)
+    expected = texts.apply(clean_text)
+    got = clean_texts(texts, backend=backend)
+    assert got.astype(object).tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_clean_texts_handles_non_object_columns(backend):
+    all_nan = pd.Series([np.nan, np.nan])
+    assert clean_texts(all_nan, backend=backend).astype(object).tolist() == ["", ""]
+    strings = pd.Series(["A\u3000b!", None], dtype="string")
+    assert clean_texts(strings, backend=backend).astype(object).tolist() == ["a b", ""]
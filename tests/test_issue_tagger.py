@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from issue_tagger import IssueTagger, TAG_COLUMNS, THEMES
+
+# short pieces that keywords are built from, so keywords overlap, nest and
+# are prefixes of one another ("log" / "login" / "login page")
+PIECES = ["lo", "log", "in", "g", "ing", "pa", "ge", " ", "slow", "s", "cr", "ash", "é", "!", "."]
+
+
+def naive_mask(text, categories):
+    """The nested loop the tagger replaces: `keyword in text.lower()`"""
+    text = text.lower()
+    mask = 0
+    for bit, keywords in enumerate(categories.values()):
+        if any(kw.lower() in text for kw in keywords):
+            mask |= 1 << bit
+    return mask
+
+
+def naive_first(text, categories, default="Other"):
+    text = text.lower()
+    for name, keywords in categories.items():
+        if any(kw.lower() in text for kw in keywords):
+            return name
+    return default
+
+
+def random_categories(rng):
+    return {f"cat{c}": ["".join(rng.choices(PIECES, k=rng.randint(1, 3))).strip() or "x"
+                        for _ in range(rng.randint(1, 5))]
+            for c in range(rng.randint(1, 8))}
+
+
+def random_text(rng):
+    return "".join(rng.choices(PIECES + ["LOG", "IN", "Slow"], k=rng.randint(0, 25)))
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_tagger_matches_substring_loop(seed):
+    rng = random.Random(seed)
+    categories = random_categories(rng)
+    tagger = IssueTagger(categories)
+    texts = [random_text(rng) for _ in range(200)]
+
+    assert tagger.tag(texts).tolist() == [naive_mask(t, categories) for t in texts]
+    for t in texts[:50]:
+        assert tagger.first(t) == naive_first(t, categories)
+
+
+def test_prefix_keywords_in_one_text():
+    categories = {"short": ["log"], "long": ["login page"], "mid": ["login"]}
+    tagger = IssueTagger(categories)
+    assert tagger.tag(["the login page froze"]).tolist() == [0b111]
+    assert tagger.tag(["login failed"]).tolist() == [0b101]
+    assert tagger.tag(["blog", None]).tolist() == [0b001, 0]
+
+
+@pytest.mark.parametrize("categories", list(TAG_COLUMNS.values()) + [THEMES])
+def test_shipped_keyword_sets(categories):
+    texts = ["App keeps crashing after the update, login is SLOW",
+             "not working since new version; customer service never helps",
+             "Mobile banking with my SIM card: developer options must be off",
+             "worst bill payment ever, branch says wait",
+             ""]
+    tagger = IssueTagger(categories)
+    assert tagger.tag(texts).tolist() == [naive_mask(t, categories) for t in texts]
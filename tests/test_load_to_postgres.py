@@ -0,0 +1,70 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from load_to_postgres import get_engine, parallel_load_reviews
+
+BANKS = ["CBE", "Abyssinia", "Dashen"]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """SQLite stand-in with the banks and reviews tables main() would create"""
+    path = tmp_path / "reviews.db"
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE banks (bank_id INTEGER PRIMARY KEY, bank_name TEXT UNIQUE, app_name TEXT);
+        CREATE TABLE reviews (
+            review_id TEXT PRIMARY KEY,
+            bank_id INTEGER REFERENCES banks(bank_id),
+            review_text TEXT, rating INTEGER, review_date DATE,
+            sentiment_label TEXT, sentiment_score FLOAT, source TEXT, content_hash BIGINT
+        );
+    """)
+    conn.executemany("INSERT INTO banks (bank_name, app_name) VALUES (?, ?)",
+                     [(b, f"{b} App") for b in BANKS])
+    conn.commit()
+    conn.close()
+    engine = get_engine(f"sqlite:///{path}", pool_size=2)
+    yield engine
+    engine.dispose()
+
+
+def reviews(n):
+    return pd.DataFrame({
+        "review_id": [f"r{i}" for i in range(n)],
+        "bank": [BANKS[i % 3] for i in range(n)],
+        "review": [f"review {i}" for i in range(n)],
+        "rating": [1 + i % 5 for i in range(n)],
+        "date": [f"2024-{1 + i % 12:02d}-15" for i in range(n)],
+        "sentiment_label": "neutral",
+        "sentiment_score": 0.0,
+    })
+
+
+def stored(engine):
+    return pd.read_sql("SELECT * FROM reviews", engine)
+
+
+@pytest.mark.parametrize("by", ["bank", "month"])
+def test_parallel_load_inserts_each_review_once(engine, by):
+    df = reviews(300)
+    # the same review scraped twice, the second time with an edited text and date
+    again = df.iloc[[5]].assign(review="edited", date="2024-12-01")
+    df = pd.concat([df, again], ignore_index=True)
+
+    assert parallel_load_reviews(engine, df, workers=2, by=by) == 300
+    rows = stored(engine)
+    assert len(rows) == 300
+    assert rows.set_index("review_id").loc["r5", "review_text"] == "edited"
+    assert rows["bank_id"].notna().all()
+
+    assert parallel_load_reviews(engine, df, workers=2, by=by) == 0
+    assert len(stored(engine)) == 300
+
+
+def test_workers_beyond_pool_size_are_refused(engine):
+    with pytest.raises(ValueError, match="pool"):
+        parallel_load_reviews(engine, reviews(10), workers=3)
+    assert len(stored(engine)) == 0
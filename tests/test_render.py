@@ -0,0 +1,30 @@
+import json
+import os
+
+import pytest
+
+from render import MANIFEST_NAME, FigureTask, render_all
+
+
+def draw_text(text, output):
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def draw_broken(inputs, output):
+    raise RuntimeError("bad figure")
+
+
+def test_failed_figure_keeps_the_others_cached(tmp_path):
+    tasks = [FigureTask(str(tmp_path / "broken.png"), draw_broken, None)]
+    tasks += [FigureTask(str(tmp_path / f"fig{i}.png"), draw_text, f"figure {i}") for i in range(4)]
+
+    with pytest.raises(RuntimeError, match="bad figure"):
+        render_all(tasks, workers=2)
+    with open(tmp_path / MANIFEST_NAME, encoding="utf-8") as f:
+        assert sorted(json.load(f)) == [f"fig{i}.png" for i in range(4)]
+    assert not os.path.exists(tmp_path / "broken.png")
+
+    rendered, skipped = render_all(tasks[1:], workers=2)
+    assert rendered == []
+    assert len(skipped) == 4
@@ -0,0 +1,66 @@
+import pytest
+
+from scrape_engine import Stream, fetch_stream_incremental
+from scrape_state import ScrapeState
+from stub_play_store import StubStore
+
+STREAM = Stream("Bank", "com.example.bank", "en", "us")
+
+
+def run(store, state, count, on_page=None):
+    seen = []
+
+    def collect(stream, batch):
+        if on_page is not None:
+            on_page(stream, batch)
+        seen.extend(r["reviewId"] for r in batch)
+
+    fetch_stream_incremental(STREAM, count, store, state=state, on_page=collect)
+    return seen
+
+
+def ids(lo, hi):
+    return {f"r{i}" for i in range(lo, hi)}
+
+
+def test_capped_runs_backfill_gap_before_moving_boundary(tmp_path):
+    store = StubStore(1000)
+    state = ScrapeState(str(tmp_path / "state.json"))
+
+    first = run(store, state, 400)
+    assert set(first) == ids(600, 1000)
+
+    store.add(1000)
+    runs = [run(store, state, 400) for _ in range(3)]
+    got = [r for seen in runs for r in seen]
+    assert len(got) == len(set(got))
+    assert set(got) == ids(1000, 2000)
+    assert state.get("Bank:en:us")["newest_review_id"] == "r1999"
+
+    store.add(50)
+    assert set(run(store, state, 400)) == ids(2000, 2050)
+
+
+def test_crashed_run_resumes_from_checkpoint(tmp_path):
+    store = StubStore(100)
+    state = ScrapeState(str(tmp_path / "state.json"))
+    run(store, state, 1000)
+    store.add(1000)
+
+    pages = []
+
+    def crash_on_third_page(stream, batch):
+        pages.append(batch)
+        if len(pages) == 3:
+            raise RuntimeError("disk full")
+
+    with pytest.raises(RuntimeError):
+        run(store, state, 2000, on_page=crash_on_third_page)
+    before = [r["reviewId"] for page in pages[:2] for r in page]
+
+    # reload from disk, like a new process would
+    state = ScrapeState(str(tmp_path / "state.json"))
+    after = run(store, state, 2000)
+    assert set(before).isdisjoint(after)
+    assert set(before) | set(after) == ids(100, 1100)
+    assert state.get("Bank:en:us")["pending"] is None
@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+import scrape_reviews
+from stub_play_store import StubStore
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    """scrape_reviews configured for one app, writing under tmp_path"""
+    monkeypatch.setattr(scrape_reviews, "APPS", {"CBE": "com.example.cbe"})
+    monkeypatch.setattr(scrape_reviews, "LOCALES", [("en", "us")])
+    monkeypatch.setattr(scrape_reviews, "OUTPUT_DIR", str(tmp_path / "raw"))
+    monkeypatch.setattr(scrape_reviews, "STATE_FILE", str(tmp_path / "raw" / "scrape_state.json"))
+    monkeypatch.setattr(scrape_reviews, "CLEANED_FILE", str(tmp_path / "cleaned_reviews.csv"))
+    monkeypatch.setattr(scrape_reviews, "INDEX_FILE", str(tmp_path / "review_index.sqlite"))
+    monkeypatch.setattr(scrape_reviews, "NEW_REVIEWS_FILE", str(tmp_path / "new_reviews.csv"))
+    monkeypatch.setattr(scrape_reviews, "STREAMING", True)
+    monkeypatch.setattr(scrape_reviews, "INCREMENTAL", True)
+    monkeypatch.setattr(scrape_reviews, "REVIEWS_PER_APP", 1000)
+
+    def run(store, dedup):
+        monkeypatch.setattr(scrape_reviews, "GLOBAL_DEDUP", dedup)
+        monkeypatch.setattr(scrape_reviews, "_index", None)
+        monkeypatch.setattr(scrape_reviews, "_seen_ids", set())
+        scrape_reviews.main(fetch_fn=store)
+        return pd.read_csv(scrape_reviews.CLEANED_FILE)
+
+    return run
+
+
+def test_turning_on_dedup_keeps_incremental_history(scraper):
+    store = StubStore(300)
+    assert len(scraper(store, dedup=False)) == 300
+
+    store.add(20)
+    cleaned = scraper(store, dedup=True)
+    assert len(cleaned) == 320
+    assert cleaned["review_id"].is_unique
+    assert len(pd.read_csv(scrape_reviews.NEW_REVIEWS_FILE)) == 20
+
+    # the seeded index now rejects reviews that are fetched again
+    store.add(5)
+    cleaned = scraper(store, dedup=True)
+    assert len(cleaned) == 325
+    assert cleaned["review_id"].is_unique